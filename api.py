@@ -1,16 +1,42 @@
-from fastapi import FastAPI, File, UploadFile, Form, Request
+from fastapi import FastAPI, File, UploadFile, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from ultralytics import YOLO
+from ultralytics.utils.plotting import colors
+import torch
 import cv2
 import numpy as np
-import io
-from PIL import Image
-import base64
 from datetime import datetime
+import os
 import uuid
-from supabase_client import update_sensor_data, create_vehicle, create_service_record, upload_image, upload_sensor_data
+import hashlib
+import functools
+from contextlib import nullcontext
+import asyncio
+from pathlib import Path
+import queue
+import threading
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from collections import namedtuple, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+try:
+    from turbojpeg import TurboJPEG, TJFLAG_FASTDCT, TJFLAG_FASTUPSAMPLE, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+from supabase_client import update_sensor_data, upload_image, upload_many, upload_sensor_data
+from supabase_client import check_in_async, update_sensor_data_async
+
+# LOGGING: callers only enqueue records; a listener thread does the stdout I/O
+log_queue = queue.Queue(-1)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S'))
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), handlers=[QueueHandler(log_queue)])  # WARNING in production
+log_listener = QueueListener(log_queue, stream_handler)
+log_listener.start()
+logger = logging.getLogger(__name__)
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +48,9 @@ app.add_middleware(
 
 # CAMERA MEMORY
 active_camera_config = {"camera_id": 0}
+# Set (and replaced) on every change; SSE subscribers wait on it
+active_camera_changed = asyncio.Event()
+ACTIVE_CAMERA_KEEPALIVE = 15  # Seconds between SSE re-sends when nothing changes
 
 # RPI CAMERA CONFIGURATION - List based
 rpi_cameras_list = []
@@ -31,11 +60,28 @@ def get_active_camera():
     return active_camera_config
 
 @app.post("/api/set-active-camera/{camera_id}")
-def set_active_camera(camera_id: int):
-    global active_camera_config
+async def set_active_camera(camera_id: int):
+    global active_camera_config, active_camera_changed
     active_camera_config["camera_id"] = camera_id
+    changed, active_camera_changed = active_camera_changed, asyncio.Event()
+    changed.set()
     return {"status": "success"}
 
+@app.get("/api/active-camera/stream")
+async def stream_active_camera():
+    """Server-Sent Events: the active camera now, then on every change"""
+    async def events():
+        while True:
+            changed = active_camera_changed
+            yield f'data: {{"camera_id": {active_camera_config["camera_id"]}}}\n\n'
+            # Periodic re-send doubles as keep-alive and lets a subscriber
+            # retry a switch it couldn't apply
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=ACTIVE_CAMERA_KEEPALIVE)
+            except asyncio.TimeoutError:
+                pass
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 # RPI CAMERA ENDPOINTS
 @app.get("/api/rpi-cameras")
 def get_rpi_cameras():
@@ -50,29 +96,308 @@ async def configure_rpi_cameras(request: Request):
         body = await request.json()
         cameras = body.get("cameras", [])
         rpi_cameras_list = cameras
-        print(f"✅ RPI Cameras configured: {rpi_cameras_list}")
+        logger.info(f"✅ RPI Cameras configured: {rpi_cameras_list}")
         return {"status": "success", "cameras": rpi_cameras_list}
     except Exception as e:
-        print(f"❌ Error configuring RPI cameras: {e}")
+        logger.error(f"❌ Error configuring RPI cameras: {e}")
         return {"status": "error", "message": str(e)}
 
+# JPEG CODEC: libjpeg-turbo (SIMD) when available, OpenCV otherwise
+try:
+    jpeg = TurboJPEG() if TurboJPEG else None
+except Exception as e:
+    logger.warning(f"⚠️ libjpeg-turbo unavailable, falling back to OpenCV: {e}")
+    jpeg = None
+
+MAX_IMAGE_SIZE = 416  # Decode straight to the YOLO input size (imgsz)
+
+def decode_image(image_bytes: bytes, max_size: int = MAX_IMAGE_SIZE):
+    """
+    Decode an upload to a BGR array no larger than max_size on its longest side
+    Returns: (image, is_original) - is_original is True when the upload is a
+    JPEG that needed no resizing, so its bytes can be reused as-is
+    """
+    img = None
+    is_jpeg = False
+    if jpeg is not None:
+        try:
+            width, height, _, _ = jpeg.decode_header(image_bytes)
+            # Let the IDCT do most of the downscale: pick the smallest
+            # supported factor that still keeps the image >= max_size
+            scale = (1, 1)
+            for num, den in sorted(jpeg.scaling_factors, key=lambda f: f[0] / f[1]):
+                if num <= den and max(width, height) * num / den >= max_size:
+                    scale = (num, den)
+                    break
+            img = jpeg.decode(
+                image_bytes,
+                scaling_factor=scale,
+                flags=TJFLAG_FASTDCT | TJFLAG_FASTUPSAMPLE
+            )
+            is_jpeg = True
+        except Exception:
+            img = None  # Not a JPEG (PNG upload etc.) - use the generic path
+
+    if img is None:
+        # OpenCV decodes any format straight to 3-channel BGR (alpha dropped);
+        # orientation is left as stored, matching the libjpeg-turbo path
+        img = cv2.imdecode(
+            np.frombuffer(image_bytes, np.uint8),
+            cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+        )
+        if img is None:
+            raise ValueError("Unsupported or corrupt image upload")
+        is_jpeg = image_bytes[:3] == b"\xff\xd8\xff"
+        height, width = img.shape[:2]
+
+    h, w = img.shape[:2]
+    if max(h, w) > max_size:
+        ratio = max_size / max(h, w)
+        new_size = (int(w * ratio), int(h * ratio))
+        img = cv2.resize(img, new_size, interpolation=cv2.INTER_AREA)
+
+    is_original = is_jpeg and img.shape[:2] == (height, width)
+    return img, is_original
+
+def encode_image(img: np.ndarray, quality: int) -> bytes:
+    """Encode a BGR array to JPEG bytes"""
+    if jpeg is not None:
+        return jpeg.encode(img, quality=quality, jpeg_subsample=TJSAMP_420)
+    _, buffer = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes()
+
+def prepare_upload(image_bytes: bytes):
+    """
+    Decode an analyze-image upload and build its clean JPEG
+    Returns: (image, clean_buffer)
+    """
+    # Decode straight to BGR, downscaled to the YOLO input size
+    img, is_original = decode_image(image_bytes)
+    
+    # CLEAN IMAGE: Reuse the uploaded JPEG as-is, otherwise encode once.
+    # The same bytes serve as the instant preview and the Supabase upload
+    clean_buffer = image_bytes if is_original else encode_image(img, 90)
+    return img, clean_buffer
+
+# TurboJPEG and cv2 release the GIL, so uploads decode in parallel on every
+# core of this one process (models, stores and serial state stay shared)
+decode_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+
+# BATCHED INFERENCE SETTINGS
+MAX_BATCH_SIZE = 4
+BATCH_TIMEOUT = 0.015  # Max wait (s) for more requests to fill a batch
+INFERENCE_KWARGS = dict(conf=0.25, iou=0.45, agnostic_nms=True, half=True, verbose=False, max_det=50, imgsz=MAX_IMAGE_SIZE)
+
+# Engines bake their precision in at export time, so no half=True at call time
+ENGINE_KWARGS = {k: v for k, v in INFERENCE_KWARGS.items() if k != "half"}
+
+# Optional INT8 engines: point TRT_INT8_DATA at a dataset YAML of representative
+# station images; Ultralytics uses it for TensorRT's entropy calibration
+TRT_INT8_DATA = os.getenv("TRT_INT8_DATA")
+
+# Models compiled to a fixed (MAX_BATCH_SIZE, 3, imgsz, imgsz) input shape
+static_batch_models = set()
+
+def load_model(weights: str):
+    """Load YOLO weights, using a cached TensorRT FP16/INT8 engine when CUDA is available"""
+    if not torch.cuda.is_available():
+        return YOLO(weights)
+    
+    # Input size is part of the name so a size change rebuilds the engine
+    imgsz = INFERENCE_KWARGS["imgsz"]
+    engine_path = Path(weights).with_suffix(f".{imgsz}.int8.engine" if TRT_INT8_DATA else f".{imgsz}.engine")
+    try:
+        if not engine_path.exists():
+            logger.info(f"🛠️ Building TensorRT engine for {weights} (one-time, cached to {engine_path})...")
+            precision = dict(int8=True, data=TRT_INT8_DATA) if TRT_INT8_DATA else dict(half=True)
+            exported = YOLO(weights).export(
+                format="engine",
+                imgsz=imgsz,
+                batch=MAX_BATCH_SIZE,
+                dynamic=False,
+                workspace=4,
+                **precision
+            )
+            Path(exported).replace(engine_path)
+        model = YOLO(str(engine_path), task="detect")
+        static_batch_models.add(id(model))
+        logger.info(f"✅ Using TensorRT engine: {engine_path}")
+        return model
+    except Exception as e:
+        logger.warning(f"⚠️ TensorRT export failed for {weights}, using PyTorch weights: {e}")
+        return YOLO(weights)
+
+# CUDA: one persistent stream for all inference (warm-up included), and let
+# cuDNN autotune once for the fixed input shapes during warm-up
+if torch.cuda.is_available():
+    torch.backends.cudnn.benchmark = True
+    inference_stream = torch.cuda.Stream()
+else:
+    inference_stream = None
+
+def inference_context():
+    """Run the enclosed CUDA work on the persistent inference stream"""
+    return torch.cuda.stream(inference_stream) if inference_stream is not None else nullcontext()
+
+WARMUP_ITERATIONS = 3
+
 # LOAD MODELS
-print("⏳ Loading Models...")
+logger.info("⏳ Loading Models...")
 try:
-    damage_model = YOLO("best.pt") 
-    brake_model = YOLO("brakes.pt") 
-    print("✅ Models Loaded")
+    damage_model = load_model("best.pt")
+    brake_model = load_model("brakes.pt")
+    logger.info("✅ Models Loaded")
     
     # PRE-WARM MODELS: Eliminate first-request cold start
-    print("🔥 Pre-warming models...")
-    dummy_img = np.zeros((640, 640, 3), dtype=np.uint8)
-    damage_model(dummy_img, verbose=False)
-    brake_model(dummy_img, verbose=False)
-    print("✅ Models pre-warmed and ready!")
+    logger.info("🔥 Pre-warming models...")
+    dummy_batch = [np.zeros((MAX_IMAGE_SIZE, MAX_IMAGE_SIZE, 3), dtype=np.uint8)] * MAX_BATCH_SIZE
+    with inference_context():
+        for _ in range(WARMUP_ITERATIONS):
+            damage_model(dummy_batch, **INFERENCE_KWARGS)
+            brake_model(dummy_batch, **INFERENCE_KWARGS)
+    logger.info("✅ Models pre-warmed and ready!")
 except:
     damage_model = YOLO("yolov8n.pt")
     brake_model = damage_model
 
+# Detection buckets for counting
+BUCKET_SKIP, BUCKET_SCRATCH, BUCKET_DENT, BUCKET_CRACK = range(4)
+
+def build_class_buckets(names: dict) -> np.ndarray:
+    """Map each class id to its counting bucket, scanning the class names once"""
+    buckets = np.full(max(names) + 1 if names else 0, BUCKET_CRACK, dtype=np.int8)
+    for cls, name in names.items():
+        label = name.lower().strip()
+        if "good" in label:
+            buckets[cls] = BUCKET_SKIP
+        elif "scratch" in label:
+            buckets[cls] = BUCKET_SCRATCH
+        elif "dent" in label:
+            buckets[cls] = BUCKET_DENT
+        # mark/crack/rust/wear/brake and anything unrecognised stay BUCKET_CRACK
+    return buckets
+
+class_buckets = {id(model): build_class_buckets(model.names) for model in (damage_model, brake_model)}
+
+# BGR box colour per class id, same palette as Ultralytics' own plotting
+class_colors = {
+    id(model): [colors(cls, True) for cls in range(max(model.names) + 1 if model.names else 0)]
+    for model in (damage_model, brake_model)
+}
+LABEL_TOP_K = 10  # Only the most confident boxes get a text label
+
+def draw_detections(img: np.ndarray, boxes: np.ndarray, cls_ids: np.ndarray, model) -> np.ndarray:
+    """Draw detection boxes on a copy of img, labelling the top-K by confidence"""
+    annotated = img.copy()
+    if len(cls_ids) == 0:
+        return annotated
+    
+    xyxy = boxes[:, :4].astype(np.int32)
+    conf = boxes[:, -2]
+    palette = class_colors[id(model)]
+    
+    for (x1, y1, x2, y2), cls in zip(xyxy, cls_ids):
+        cv2.rectangle(annotated, (x1, y1), (x2, y2), palette[cls], 2)
+    
+    for i in np.argsort(-conf)[:LABEL_TOP_K]:
+        x1, y1 = xyxy[i][:2]
+        label = f"{model.names.get(int(cls_ids[i]), '')} {conf[i]:.2f}"
+        cv2.putText(annotated, label, (x1, max(y1 - 5, 12)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, palette[cls_ids[i]], 1, cv2.LINE_AA)
+    
+    return annotated
+
+# BATCHED INFERENCE: one worker owns the models and runs concurrent
+# requests (e.g. the four station cameras) through a single YOLO call
+
+class InferenceRequest:
+    """A single frame waiting for YOLO inference"""
+    __slots__ = ("future", "img", "camera_id")
+
+    def __init__(self, img: np.ndarray, camera_id: int):
+        self.future = Future()
+        self.img = img
+        self.camera_id = camera_id
+
+inference_queue = queue.Queue()
+
+def get_model(camera_id: int):
+    """Brake camera uses the brake model, all other cameras the damage model"""
+    return brake_model if camera_id == 3 else damage_model
+
+# PINNED INPUT: on CUDA, frames are written into one preallocated page-locked
+# (B, 3, imgsz, imgsz) uint8 slab and copied to the GPU asynchronously, instead of
+# Ultralytics allocating fresh pageable tensors for every batch. The CPU does a
+# single BGR->RGB/HWC->CHW copy; the fp16 cast and /255 happen on the GPU
+IMG_SIZE = INFERENCE_KWARGS["imgsz"]
+PAD_VALUE = 114  # Ultralytics letterbox grey
+
+if torch.cuda.is_available():
+    input_slab = torch.empty(MAX_BATCH_SIZE, 3, IMG_SIZE, IMG_SIZE, dtype=torch.uint8).pin_memory()
+else:
+    input_slab = None
+
+def fill_input_slab(imgs: list, full_batch: bool = False) -> torch.Tensor:
+    """
+    Write BGR frames (<= IMG_SIZE, see decode_image) into the pinned slab as RGB
+    Frames sit in the top-left corner unscaled, so box coordinates come back
+    in the original frame's pixel space.
+    Returns: GPU tensor of shape (len(imgs) or MAX_BATCH_SIZE, 3, IMG_SIZE, IMG_SIZE)
+    """
+    for i, img in enumerate(imgs):
+        h, w = img.shape[:2]
+        input_slab[i].fill_(PAD_VALUE)
+        # HWC BGR -> CHW RGB by indexing the channels in reverse: one strided
+        # copy per plane, no flipped intermediate tensor
+        dst = input_slab[i, :, :h, :w]
+        for c in range(3):
+            dst[c].copy_(torch.from_numpy(img[:, :, 2 - c]))
+    
+    n = MAX_BATCH_SIZE if full_batch else len(imgs)
+    if full_batch:
+        input_slab[len(imgs):].fill_(PAD_VALUE)
+    return input_slab[:n].to("cuda", non_blocking=True).half().div_(255.0)
+
+def inference_worker():
+    """Drain up to MAX_BATCH_SIZE requests and run them as one batch per model"""
+    while True:
+        batch = [inference_queue.get()]
+        try:
+            while len(batch) < MAX_BATCH_SIZE:
+                batch.append(inference_queue.get(timeout=BATCH_TIMEOUT))
+        except queue.Empty:
+            pass
+
+        groups = {}
+        for req in batch:
+            groups.setdefault(id(get_model(req.camera_id)), []).append(req)
+
+        with inference_context():
+            for reqs in groups.values():
+                try:
+                    model = get_model(reqs[0].camera_id)
+                    imgs = [req.img for req in reqs]
+                    # Engines only exist on CUDA hosts, which always have the
+                    # slab - it pads fixed-shape batches itself
+                    batch_input = fill_input_slab(imgs, full_batch=id(model) in static_batch_models) if input_slab is not None else imgs
+                    kwargs = ENGINE_KWARGS if id(model) in static_batch_models else INFERENCE_KWARGS
+                    results = model(batch_input, **kwargs)
+                    if inference_stream is not None:
+                        # Detection workers read these tensors from other threads/streams
+                        inference_stream.synchronize()
+                    for req, result in zip(reqs, results):
+                        req.future.set_result(result)
+                except Exception as e:
+                    for req in reqs:
+                        req.future.set_exception(e)
+
+def run_inference(img: np.ndarray, camera_id: int):
+    """Queue a frame for batched inference and block until its result is ready"""
+    req = InferenceRequest(img, camera_id)
+    inference_queue.put(req)
+    return req.future.result()
+
+# Latest detection JSON; the JPEGs themselves live in image_store and are
+# served as raw bytes
 latest_detection_store = {}
 
 # Store per-station detection data for multi-camera RPI feeds
@@ -83,9 +408,191 @@ station_detection_store = {
     "brake": {}
 }
 
+# Raw JPEG bytes + ETag, keyed by "latest/annotated", "latest/clean" or station
+image_store = {}
+
+def store_image(key: str, image_bytes: bytes) -> str:
+    """Keep the latest JPEG for key and return its ETag"""
+    etag = hashlib.sha1(image_bytes).hexdigest()
+    image_store[key] = (image_bytes, etag)
+    return etag
+
+def image_response(request: Request, key: str) -> Response:
+    """Serve a stored JPEG, answering 304 when the client already has it"""
+    entry = image_store.get(key)
+    if entry is None:
+        return Response(status_code=404)
+    image_bytes, etag = entry
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=image_bytes, media_type="image/jpeg", headers=headers)
+
+# One-off analyze-image JPEGs, served by /api/image/{key}. Bounded LRU so
+# unclaimed previews can't grow memory without limit
+IMAGE_CACHE_SIZE = 50
+image_cache = OrderedDict()
+image_cache_lock = threading.Lock()
+
+def cache_image(image_bytes: bytes) -> str:
+    """Keep a JPEG under a fresh key and return its /api/image path"""
+    key = uuid.uuid4().hex
+    with image_cache_lock:
+        image_cache[key] = image_bytes
+        while len(image_cache) > IMAGE_CACHE_SIZE:
+            image_cache.popitem(last=False)
+    return f"/api/image/{key}"
+
 # Store current service record ID
 current_service_record_id = None
 
+def process_yolo_background(img, camera_id, is_manual, service_record_id, should_upload, clean_buffer):
+    """Run YOLO on an analyze-image upload, update the store and optionally save to Supabase"""
+    global latest_detection_store
+    try:
+        logger.debug("🚀 Starting background YOLO inference...")
+
+        # Run YOLO inference (batched with any concurrent requests)
+        results = [run_inference(img, camera_id)]
+
+        # Count detections: one device->host copy of the whole boxes tensor
+        # (xyxy, conf, cls), then vectorized lookups
+        model = get_model(camera_id)
+        boxes = results[0].boxes.data.cpu().numpy()
+        cls_ids = boxes[:, -1].astype(np.int32)
+        counts = np.bincount(class_buckets[id(model)][cls_ids], minlength=4)
+        scratch_count = int(counts[BUCKET_SCRATCH])
+        dent_count = int(counts[BUCKET_DENT])
+        crack_count = int(counts[BUCKET_CRACK])
+
+        logger.info(f"📈 YOLO Results: Scratches={scratch_count}, Dents={dent_count}, Marks={crack_count}")
+
+        # Generate high-quality annotated image. With no boxes it would be
+        # identical to the clean one, so reuse those bytes
+        if len(cls_ids) == 0:
+            annotated_buffer = clean_buffer
+        else:
+            annotated = draw_detections(img, boxes, cls_ids, model)
+            annotated_buffer = encode_image(annotated, 95)
+
+        # Update latest detection store
+        final_response = {
+            "imageUrl": None,
+            "annotatedImageUrl": None,
+            "scratchCount": scratch_count,
+            "dentCount": dent_count,
+            "crackCount": crack_count,
+            "timestamp": datetime.now().timestamp(),
+            "status": "complete"
+        }
+
+        if str(is_manual).lower() != "true":
+            annotated_etag = store_image("latest/annotated", annotated_buffer)
+            clean_etag = store_image("latest/clean", clean_buffer)
+            final_response["annotatedImagePath"] = f"/api/latest-detection/image/annotated?v={annotated_etag}"
+            final_response["cleanImagePath"] = f"/api/latest-detection/image/clean?v={clean_etag}"
+            latest_detection_store = final_response
+
+        # SAVE TO DATABASE: Only when should_upload=True. Runs on its own pool
+        # so this worker is free for the next frame while Supabase round-trips
+        if should_upload:
+            logger.info("💾 Uploading to Supabase in background...")
+            save_pool.submit(save_detection, final_response, camera_id, service_record_id, clean_buffer, annotated_buffer)
+    except Exception as e:
+        logger.error(f"❌ Background YOLO error: {e}")
+
+# Pool for blocking Supabase writes alongside the image uploads (which go
+# through upload_many's own pool), plus a separate pool that runs each
+# save_detection (which itself waits on upload_pool)
+upload_pool = ThreadPoolExecutor(max_workers=8)
+save_pool = ThreadPoolExecutor(max_workers=4)
+
+def save_detection(final_response, camera_id, service_record_id, clean_buffer, annotated_buffer):
+    """Upload both images and the detection results to Supabase"""
+    scratch_count = final_response["scratchCount"]
+    dent_count = final_response["dentCount"]
+    crack_count = final_response["crackCount"]
+    try:
+        clean_filename = f"clean_{uuid.uuid4()}.jpg"
+        annotated_filename = f"annotated_{uuid.uuid4()}.jpg"
+
+        # The two image uploads and the counts update are independent
+        # round-trips - run them concurrently
+        if service_record_id:
+            counts_future = upload_pool.submit(
+                update_sensor_data,
+                service_record_id=service_record_id,
+                scratches_count=scratch_count,
+                dents_count=dent_count,
+                crack_count=crack_count
+            )
+        # No detections: the annotated image is the clean one, upload it once
+        if annotated_buffer is clean_buffer:
+            annotated_filename = clean_filename
+            img_url = ann_img_url = upload_image(clean_buffer, clean_filename)
+        else:
+            img_url, ann_img_url = upload_many([(clean_buffer, clean_filename), (annotated_buffer, annotated_filename)])
+        logger.info(f"✅ Clean Image uploaded: {clean_filename}")
+        logger.info(f"✅ Annotated Image uploaded: {annotated_filename}")
+
+        # Fill in the URLs once known; this dict may be the live
+        # latest_detection_store, so pollers pick them up too
+        final_response["imageUrl"] = img_url
+        final_response["annotatedImageUrl"] = ann_img_url
+
+        if service_record_id:
+            counts_future.result()
+
+            sensor_data_dict = {
+                "service_record_id": service_record_id,
+                "timestamp": datetime.now().isoformat(),
+                "camera_id": camera_id,
+                "detection_results": {
+                    "scratches_count": scratch_count,
+                    "dents_count": dent_count,
+                    "crack_count": crack_count
+                },
+                "image_url": img_url,
+                "annotated_image_url": ann_img_url
+            }
+            sensor_filename = f"sensor_data_{service_record_id}_{uuid.uuid4()}.json"
+            upload_sensor_data(sensor_data_dict, sensor_filename)
+            logger.info(f"✅ Sensor data exported: {sensor_filename}")
+    except Exception as e:
+        logger.error(f"❌ Error uploading to Supabase: {e}")
+
+# DETECTION JOBS: a persistent worker pool handles post-processing and
+# hands off uploads; only the inference worker ever touches the models
+DetectionJob = namedtuple("DetectionJob", "img camera_id is_manual service_record_id should_upload clean_buffer")
+DETECTION_WORKERS = MAX_BATCH_SIZE  # Enough concurrent jobs to fill a batch
+detection_queue = queue.Queue(maxsize=32)
+
+def submit_detection_job(job: DetectionJob):
+    """Queue a job; when full, drop the oldest so the newest frame wins"""
+    while True:
+        try:
+            detection_queue.put_nowait(job)
+            return
+        except queue.Full:
+            try:
+                dropped = detection_queue.get_nowait()
+                logger.warning(f"⚠️ Detection queue full - dropped frame from camera {dropped.camera_id}")
+            except queue.Empty:
+                pass
+
+def detection_worker():
+    """Process queued detection jobs forever"""
+    while True:
+        job = detection_queue.get()
+        process_yolo_background(*job)
+
+@app.on_event("startup")
+def start_workers():
+    """Start the inference worker and detection worker pool"""
+    threading.Thread(target=inference_worker, daemon=True).start()
+    for _ in range(DETECTION_WORKERS):
+        threading.Thread(target=detection_worker, daemon=True).start()
+
 @app.post("/api/analyze-image")
 async def analyze_image(
     file: UploadFile = File(...), 
@@ -94,35 +601,20 @@ async def analyze_image(
     service_record_id: str = Form(None),
     should_upload: bool = Form(False)
 ):
-    global latest_detection_store
-    
-    print(f"🔍 analyze-image called: camera_id={camera_id}, is_manual={is_manual}, should_upload={should_upload}, service_record_id={service_record_id}")
+    logger.info(f"🔍 analyze-image called: camera_id={camera_id}, is_manual={is_manual}, should_upload={should_upload}, service_record_id={service_record_id}")
     
     try:
         image_bytes = await file.read()
-        pil_img = Image.open(io.BytesIO(image_bytes))
-        
-        if pil_img.mode == 'RGBA':
-            pil_img = pil_img.convert('RGB')
         
-        # OPTIMIZED: Resize to 640px max for faster processing
-        max_size = 640
-        if max(pil_img.size) > max_size:
-            ratio = max_size / max(pil_img.size)
-            new_size = tuple(int(dim * ratio) for dim in pil_img.size)
-            pil_img = pil_img.resize(new_size, Image.LANCZOS)
-            
-        img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+        # Decode/encode are CPU-bound - keep them off the event loop
+        loop = asyncio.get_running_loop()
+        img, clean_buffer = await loop.run_in_executor(decode_pool, prepare_upload, image_bytes)
+        preview_path = cache_image(clean_buffer)
         
-        # INSTANT PREVIEW: Return image immediately before YOLO runs
-        _, preview_buffer = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 80])
-        preview_b64 = base64.b64encode(preview_buffer).decode("utf-8")
-        clean_b64 = preview_b64  # Use same preview for clean image
-        
-        # Prepare instant response
+        # Prepare instant response - images are fetched as raw JPEG by path
         response = {
-            "annotatedImage": preview_b64,  # Preview shown immediately
-            "cleanImage": clean_b64,
+            "annotatedImagePath": preview_path,  # Preview shown immediately
+            "cleanImagePath": preview_path,
             "imageUrl": None,
             "annotatedImageUrl": None,
             "scratchCount": 0,  # Will be updated in background
@@ -133,121 +625,36 @@ async def analyze_image(
         }
         
         # BACKGROUND YOLO PROCESSING: Don't block response
-        import threading
-        def process_yolo_background():
-            try:
-                print("🚀 Starting background YOLO inference...")
-                
-                # Run YOLO inference
-                if camera_id == 3:
-                    results = brake_model(img, conf=0.25, iou=0.45, agnostic_nms=True, half=True, verbose=False, max_det=50, imgsz=640)
-                    names = brake_model.names
-                else:
-                    results = damage_model(img, conf=0.25, iou=0.45, agnostic_nms=True, half=True, verbose=False, max_det=50, imgsz=640)
-                    names = damage_model.names
-                
-                # Count detections
-                scratch_count = 0
-                dent_count = 0
-                crack_count = 0
-                
-                for result in results:
-                    for box in result.boxes:
-                        cls = int(box.cls.item())
-                        label = names.get(cls, "").lower().strip()
-                        
-                        if "good" in label:
-                            continue
-                        if "scratch" in label:
-                            scratch_count += 1
-                        elif "dent" in label:
-                            dent_count += 1
-                        elif any(x in label for x in ["mark", "crack", "rust", "wear", "brake"]):
-                            crack_count += 1
-                        else:
-                            crack_count += 1
-                
-                print(f"📈 YOLO Results: Scratches={scratch_count}, Dents={dent_count}, Marks={crack_count}")
-                
-                # Generate high-quality annotated image
-                annotated = results[0].plot()
-                _, annotated_buffer = cv2.imencode(".jpg", annotated, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                annotated_b64 = base64.b64encode(annotated_buffer).decode("utf-8")
-                
-                _, clean_buffer = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                
-                # Update latest detection store
-                final_response = {
-                    "annotatedImage": annotated_b64,
-                    "cleanImage": clean_b64,
-                    "imageUrl": None,
-                    "annotatedImageUrl": None,
-                    "scratchCount": scratch_count,
-                    "dentCount": dent_count,
-                    "crackCount": crack_count,
-                    "timestamp": datetime.now().timestamp(),
-                    "status": "complete"
-                }
-                
-                if str(is_manual).lower() != "true":
-                    global latest_detection_store
-                    latest_detection_store = final_response
-                
-                # SAVE TO DATABASE: Only when should_upload=True
-                if should_upload:
-                    print(f"💾 Uploading to Supabase in background...")
-                    try:
-                        clean_filename = f"clean_{uuid.uuid4()}.jpg"
-                        annotated_filename = f"annotated_{uuid.uuid4()}.jpg"
-                        
-                        img_url = upload_image(clean_buffer.tobytes(), clean_filename)
-                        print(f"✅ Clean Image uploaded: {clean_filename}")
-                        
-                        ann_img_url = upload_image(annotated_buffer.tobytes(), annotated_filename)
-                        print(f"✅ Annotated Image uploaded: {annotated_filename}")
-                        
-                        if service_record_id:
-                            update_sensor_data(
-                                service_record_id=service_record_id,
-                                scratches_count=scratch_count,
-                                dents_count=dent_count,
-                                crack_count=crack_count
-                            )
-                            
-                            sensor_data_dict = {
-                                "service_record_id": service_record_id,
-                                "timestamp": datetime.now().isoformat(),
-                                "camera_id": camera_id,
-                                "detection_results": {
-                                    "scratches_count": scratch_count,
-                                    "dents_count": dent_count,
-                                    "crack_count": crack_count
-                                },
-                                "image_url": img_url,
-                                "annotated_image_url": ann_img_url
-                            }
-                            sensor_filename = f"sensor_data_{service_record_id}_{uuid.uuid4()}.json"
-                            upload_sensor_data(sensor_data_dict, sensor_filename)
-                            print(f"✅ Sensor data exported: {sensor_filename}")
-                    except Exception as e:
-                        print(f"❌ Error uploading to Supabase: {e}")
-            except Exception as e:
-                print(f"❌ Background YOLO error: {e}")
-        
-        # Start background thread - don't wait!
-        yolo_thread = threading.Thread(target=process_yolo_background, daemon=True)
-        yolo_thread.start()
-        print("⚡ Instant preview returned - YOLO processing in background!")
+        submit_detection_job(DetectionJob(img, camera_id, is_manual, service_record_id, should_upload, clean_buffer))
+        logger.debug("⚡ Instant preview returned - YOLO processing in background!")
         
         return response
     except Exception as e:
-        print(f"Error: {e}")
+        logger.error(f"❌ analyze-image error: {e}")
         return {"success": False}
 
+@app.get("/api/image/{key}")
+def get_image(key: str):
+    """Serve a cached analyze-image JPEG; keys are unique so it never changes"""
+    with image_cache_lock:
+        image_bytes = image_cache.get(key)
+        if image_bytes is not None:
+            image_cache.move_to_end(key)
+    if image_bytes is None:
+        return Response(status_code=404)
+    return Response(content=image_bytes, media_type="image/jpeg", headers={"Cache-Control": "public, max-age=86400, immutable"})
+
 @app.get("/api/latest-detection")
 def get_latest():
     return latest_detection_store
 
+@app.get("/api/latest-detection/image/{kind}")
+def get_latest_image(kind: str, request: Request):
+    """Serve the latest annotated or clean detection image as JPEG"""
+    if kind not in ("annotated", "clean"):
+        return Response(status_code=404)
+    return image_response(request, f"latest/{kind}")
+
 @app.get("/api/health")
 def health():
     return {"status": "online"}
@@ -262,20 +669,16 @@ async def start_service(
     global current_service_record_id
     
     try:
-        vehicle = create_vehicle(car_number_plate, car_owner_name, car_id)
-        if not vehicle:
-            return {"success": False, "error": "Failed to create vehicle"}
-        
-        service_record_id = create_service_record(vehicle["id"])
-        if not service_record_id:
-            return {"success": False, "error": "Failed to create service record"}
+        checked_in = await check_in_async(car_number_plate, car_owner_name, car_id)
+        if not checked_in:
+            return {"success": False, "error": "Failed to check in vehicle"}
         
-        current_service_record_id = service_record_id
+        current_service_record_id = checked_in["service_record_id"]
         
         return {
             "success": True,
-            "service_record_id": service_record_id,
-            "vehicle_id": vehicle["id"]
+            "service_record_id": checked_in["service_record_id"],
+            "vehicle_id": checked_in["vehicle_id"]
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -299,7 +702,8 @@ async def update_sensors(
             drivable_range_km=drivable_range_km,
             vibration_level=vibration_level,
             rpm=rpm,
-            voltage=voltage
+            voltage=voltage,
+            coalesce=True
         )
         return {"success": success}
     except Exception as e:
@@ -317,9 +721,9 @@ async def save_sensor_data(
     voltage: float = Form(None)
 ):
     """Manually save sensor data to database (called from ECU Diagnostics page)"""
-    print(f"💾 MANUAL SENSOR SAVE: service_record_id={service_record_id}")
+    logger.info(f"💾 MANUAL SENSOR SAVE: service_record_id={service_record_id}")
     try:
-        success = update_sensor_data(
+        success = await update_sensor_data_async(
             service_record_id=service_record_id,
             battery_level=battery_level,
             drivable_range_km=drivable_range_km,
@@ -330,19 +734,19 @@ async def save_sensor_data(
             voltage=voltage
         )
         if success:
-            print(f"✅ Sensor data saved successfully for record {service_record_id}")
+            logger.info(f"✅ Sensor data saved successfully for record {service_record_id}")
         else:
-            print(f"❌ Failed to save sensor data")
+            logger.error("❌ Failed to save sensor data")
         return {"success": success}
     except Exception as e:
-        print(f"❌ Error saving sensor data: {e}")
+        logger.error(f"❌ Error saving sensor data: {e}")
         return {"success": False, "error": str(e)}
 
 
 # MULTI-CAMERA RPI FEED ENDPOINTS
 @app.post("/api/update/{station}")
-async def update_station_feed(station: str, file: UploadFile = File(...)):
-    """Receive annotated images from RPI multi-camera script"""
+async def update_station_feed(station: str, request: Request):
+    """Receive annotated images from RPI multi-camera script (raw image/jpeg body or multipart "file")"""
     global station_detection_store
     
     valid_stations = ["front", "left", "right", "brake"]
@@ -350,24 +754,27 @@ async def update_station_feed(station: str, file: UploadFile = File(...)):
         return {"success": False, "error": f"Invalid station. Must be one of: {valid_stations}"}
     
     try:
-        # Read the uploaded image (already annotated by RPI YOLO)
-        image_bytes = await file.read()
-        
-        # Convert to base64 for storage and transmission
-        annotated_b64 = base64.b64encode(image_bytes).decode("utf-8")
+        # Read the uploaded image (already annotated by RPI YOLO). A raw
+        # JPEG body skips multipart framing on both ends
+        if request.headers.get("content-type", "").startswith("image/"):
+            image_bytes = await request.body()
+        else:
+            form = await request.form()
+            image_bytes = await form["file"].read()
         
-        # Store the latest feed for this station
+        # Store the raw JPEG; the JSON feed only carries a versioned image path
+        etag = store_image(station, image_bytes)
         station_detection_store[station] = {
-            "annotatedImage": annotated_b64,
+            "imagePath": f"/api/station-feed/{station}/image?v={etag}",
             "timestamp": datetime.now().timestamp(),
             "station": station
         }
         
-        print(f"✅ Received feed from {station.upper()} station")
+        logger.debug(f"✅ Received feed from {station.upper()} station")
         return {"success": True, "station": station}
         
     except Exception as e:
-        print(f"❌ Error receiving {station} feed: {e}")
+        logger.error(f"❌ Error receiving {station} feed: {e}")
         return {"success": False, "error": str(e)}
 
 @app.get("/api/station-feed/{station}")
@@ -379,12 +786,17 @@ def get_station_feed(station: str):
     
     return station_detection_store.get(station, {})
 
+@app.get("/api/station-feed/{station}/image")
+def get_station_image(station: str, request: Request):
+    """Serve the latest annotated frame for a station as JPEG"""
+    return image_response(request, station)
+
 if __name__ == "__main__":
     import uvicorn
     import threading
     import serial
     import time
-    import json
+    import orjson
     import re
 
     SERIAL_PORT = "COM5" 
@@ -394,37 +806,56 @@ if __name__ == "__main__":
     if current_service_record_id is None:
         current_service_record_id = DEFAULT_SERVICE_ID
 
+    PAIR_RE = re.compile(r'(\w+)[:=]\s*([\w\.]+)')
+
+    # Substring of a "key:value" serial key -> sensor fields it fills
+    KEY_FIELDS = (
+        ("rpm", ("rpm",)),
+        ("batt", ("battery_level", "battery_percent")),
+        ("volt", ("voltage",)),
+        ("vib", ("vibration_level",)),
+        ("range", ("drivable_range_km",)),
+        ("wear", ("brake_wear_rate",)),
+    )
+    @functools.lru_cache(maxsize=64)  # Bounded: line noise can produce endless distinct keys
+    def fields_for_key(key: str) -> tuple:
+        """Resolve a serial key to its sensor fields"""
+        return tuple(f for sub, fs in KEY_FIELDS if sub in key for f in fs)
+
     def parse_serial_line(line: str) -> dict:
         data = {}
         line = line.strip()
         
-        try:
-            json_data = json.loads(line)
-            mapped_data = {}
-            
-            if "rpm" in json_data:
-                mapped_data["rpm"] = int(json_data["rpm"])
-            
-            if "battery" in json_data:
-                mapped_data["battery_level"] = float(json_data["battery"])
-                mapped_data["battery_percent"] = float(json_data["battery"])
-            
-            if "voltage" in json_data:
-                mapped_data["voltage"] = float(json_data["voltage"])
-            
-            if "vibration" in json_data:
-                mapped_data["vibration_level"] = str(json_data["vibration"])
-            
-            if "range" in json_data:
-                mapped_data["drivable_range_km"] = float(json_data["range"])
-            
-            return mapped_data
-        except:
-            pass
+        # Only JSON objects start with "{" - skip the exception path otherwise
+        if line[:1] == "{":
+            try:
+                json_data = orjson.loads(line)
+                mapped_data = {}
+                
+                if "rpm" in json_data:
+                    mapped_data["rpm"] = int(json_data["rpm"])
+                
+                if "battery" in json_data:
+                    mapped_data["battery_level"] = float(json_data["battery"])
+                    mapped_data["battery_percent"] = float(json_data["battery"])
+                
+                if "voltage" in json_data:
+                    mapped_data["voltage"] = float(json_data["voltage"])
+                
+                if "vibration" in json_data:
+                    mapped_data["vibration_level"] = str(json_data["vibration"])
+                
+                if "range" in json_data:
+                    mapped_data["drivable_range_km"] = float(json_data["range"])
+                
+                return mapped_data
+            except:
+                pass
             
-        pairs = re.findall(r'(\w+)[:=]\s*([\w\.]+)', line)
-        for key, val in pairs:
-            key = key.lower()
+        for key, val in PAIR_RE.findall(line):
+            fields = fields_for_key(key.lower())
+            if not fields:
+                continue
             try:
                 if '.' in val:
                     val = float(val)
@@ -433,59 +864,59 @@ if __name__ == "__main__":
             except:
                 pass
             
-            if "rpm" in key: data["rpm"] = val
-            if "batt" in key: 
-                data["battery_level"] = val
-                data["battery_percent"] = val
-            if "volt" in key: data["voltage"] = val
-            if "vib" in key: data["vibration_level"] = str(val)
-            if "range" in key: data["drivable_range_km"] = val
-            if "wear" in key: data["brake_wear_rate"] = val
+            for field in fields:
+                data[field] = str(val) if field == "vibration_level" else val
             
         return data
 
     def serial_worker():
         global current_service_record_id
-        print(f"🔌 Attempting to connect to Arduino on {SERIAL_PORT}...")
+        logger.info(f"🔌 Attempting to connect to Arduino on {SERIAL_PORT}...")
         
         while True:
             try:
                 with serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1) as ser:
-                    print(f"✅ Serial Connected on {SERIAL_PORT}")
+                    logger.info(f"✅ Serial Connected on {SERIAL_PORT}")
+                    # Windows drivers default to a small RX buffer; give bursts room
+                    if hasattr(ser, "set_buffer_size"):
+                        ser.set_buffer_size(rx_size=4096)
                     
                     while True:
-                        if ser.in_waiting:
-                            try:
-                                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                                if not line: continue
-                                
-                                print(f"📥 Arduino: {line}")
-                                
-                                sensor_data = parse_serial_line(line)
+                        # Blocks until a full line arrives (or the 1s timeout)
+                        raw = ser.readline()
+                        if not raw: continue
+                        try:
+                            line = raw.decode('utf-8', errors='ignore').strip()
+                            if not line: continue
+                            
+                            logger.debug(f"📥 Arduino: {line}")
+                            
+                            sensor_data = parse_serial_line(line)
+                            
+                            if sensor_data:
+                                target_id = current_service_record_id or DEFAULT_SERVICE_ID
                                 
-                                if sensor_data:
-                                    target_id = current_service_record_id or DEFAULT_SERVICE_ID
-                                    
-                                    print(f"🔄 Updating Sensors for {target_id}: {sensor_data}")
-                                    
-                                    update_sensor_data(
-                                        service_record_id=target_id,
-                                        **sensor_data
-                                    )
-                            except Exception as e:
-                                print(f"⚠️ Parse/Update Error: {e}")
+                                logger.debug(f"🔄 Updating Sensors for {target_id}: {sensor_data}")
                                 
-                        time.sleep(0.1)
+                                update_sensor_data(
+                                    service_record_id=target_id,
+                                    coalesce=True,
+                                    **sensor_data
+                                )
+                        except Exception as e:
+                            logger.warning(f"⚠️ Parse/Update Error: {e}")
                         
             except serial.SerialException:
-                print(f"❌ Serial Connection Failed ({SERIAL_PORT}). Retrying in 5s...")
+                logger.error(f"❌ Serial Connection Failed ({SERIAL_PORT}). Retrying in 5s...")
                 time.sleep(5)
             except Exception as e:
-                print(f"❌ Serial Worker Error: {e}")
+                logger.error(f"❌ Serial Worker Error: {e}")
                 time.sleep(5)
 
     t = threading.Thread(target=serial_worker, daemon=True)
     t.start()
 
-    print(f"🚀 Starting Server... (Service ID: {current_service_record_id or 'None'})")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    logger.info(f"🚀 Starting Server... (Service ID: {current_service_record_id or 'None'})")
+    # Single worker: models, stores and the serial thread live in this process.
+    # loop/http "auto" resolve to uvloop + httptools when installed
+    uvicorn.run(app, host="0.0.0.0", port=8000, workers=1, loop="auto", http="auto")
\ No newline at end of file
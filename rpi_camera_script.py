@@ -1,8 +1,13 @@
 import cv2
 import threading
 import requests
+from requests.adapters import HTTPAdapter
 import time
 from ultralytics import YOLO
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
 
 # ======================================================
 # 1. CONFIGURATION
@@ -28,6 +33,25 @@ MODEL_BRAKE   = YOLO("brakeshoe_model.pt")      # Model 2
 
 print("🔥 Models loaded: Scratch/Dent + Brake Shoe")
 
+# JPEG encoder: libjpeg-turbo (SIMD) when available, OpenCV otherwise
+try:
+    JPEG = TurboJPEG() if TurboJPEG else None
+except Exception as e:
+    print(f"⚠️  libjpeg-turbo unavailable, using OpenCV JPEG encoder: {e}")
+    JPEG = None
+
+def encode_jpeg(frame, quality=95):
+    """Encode a BGR frame to JPEG bytes"""
+    if JPEG is not None:
+        return JPEG.encode(frame, quality=quality, jpeg_subsample=TJSAMP_420)
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes()
+
+
+# Shared keep-alive connection pool for every camera thread
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
 
 # ======================================================
 # 3. TEST CONNECTION TO BACKEND
@@ -61,13 +85,33 @@ def test_backend_connection():
 # 4. CAMERA WORKER (WITH STATUS INDICATORS)
 # ======================================================
 
+# GStreamer capture: the driver hands frames straight to appsink, which keeps
+# only the newest one (needs an OpenCV build with GStreamer, e.g. apt's python3-opencv)
+GST_PIPELINE = (
+    "v4l2src device=/dev/video{index} ! "
+    "video/x-raw,width=640,height=480,framerate=30/1 ! "
+    "videoconvert ! video/x-raw,format=BGR ! "
+    "appsink drop=1 max-buffers=1"
+)
+
+def open_camera(usb_index):
+    """Open a camera at 640x480, keeping only the newest frame in the driver buffer"""
+    cap = cv2.VideoCapture(GST_PIPELINE.format(index=usb_index), cv2.CAP_GSTREAMER)
+    if cap.isOpened():
+        return cap
+    
+    # No GStreamer support: plain V4L2 capture
+    cap = cv2.VideoCapture(usb_index)
+    cap.set(3, 640)
+    cap.set(4, 480)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
 def camera_worker(station, usb_index):
     print(f"🚀 Starting {station.upper()} camera on USB {usb_index}")
 
     # Open camera
-    cap = cv2.VideoCapture(usb_index)
-    cap.set(3, 640)
-    cap.set(4, 480)
+    cap = open_camera(usb_index)
 
     if not cap.isOpened():
         print(f"❌ Could not open camera {station}")
@@ -92,12 +136,17 @@ def camera_worker(station, usb_index):
     # Main loop
     while True:
         try:
-            ret, frame = cap.read()
+            # The capture keeps a one-frame buffer (appsink max-buffers=1 /
+            # BUFFERSIZE=1), so a single grab() already gets the newest frame;
+            # decode only that one
+            ret = cap.grab()
+            if ret:
+                ret, frame = cap.retrieve()
             if not ret:
                 print(f"⚠️  Lost feed on {station.upper()}. Reconnecting…")
                 cap.release()
                 time.sleep(1)
-                cap = cv2.VideoCapture(usb_index)
+                cap = open_camera(usb_index)
                 continue
 
             # YOLO Inference
@@ -105,11 +154,10 @@ def camera_worker(station, usb_index):
             annotated = results.plot()
 
             # Encode image
-            _, buffer = cv2.imencode('.jpg', annotated)
-            files = {'file': ('image.jpg', buffer.tobytes(), 'image/jpeg')}
+            files = {'file': ('image.jpg', encode_jpeg(annotated), 'image/jpeg')}
 
             # POST to backend with status tracking
-            response = requests.post(endpoint, files=files, timeout=1)
+            response = SESSION.post(endpoint, files=files, timeout=1)
             
             frame_count += 1
             
@@ -1,11 +1,24 @@
 # Multi-Camera RPi Script with LOCAL YOLO Processing
 # Runs 2 models: scratch/dent for front/left/right, brake model for brake station
+import os
 import cv2
+import numpy as np
+import torch
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import threading
+import queue
+from collections import deque
 import base64
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from ultralytics import YOLO
+from ultralytics.utils.plotting import colors
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
 
 # ======================================================
 # CONFIGURATION
@@ -23,23 +36,83 @@ CAMERA_MAPPING = {
     3: ("brake", 3)    # Brake -> USB Index 3
 }
 
+# Per-camera lookups resolved once, indexed by camera_id in the hot loop
+STATION_NAMES = tuple(CAMERA_MAPPING[i][0] for i in range(4))
+UPDATE_URLS = tuple(f"{BASE_URL}/api/update/{station}" for station in STATION_NAMES)
+
+# Detection rate per camera. Frames in between are still sent for the live
+# feed, re-using the last detections, so YOLO only sees a subset of frames
+TARGET_DET_FPS = 8
+
+# Target period of the process/send loop (10 Hz); each pass only sleeps for
+# whatever is left after inference, encoding and sending
+LOOP_PERIOD = 0.1
+
+# Static scenes: a frame is only sent when its 32x32 thumbnail differs from
+# the last sent one by more than this mean absolute difference (0-255), or
+# there are new detections, or HEARTBEAT_SECONDS have passed
+CHANGE_THRESHOLD = 2.0
+HEARTBEAT_SECONDS = 5.0
+
+# Dashboard tiles are small: annotate and encode at this size. YOLO still
+# sees the full 640x480 capture
+DISPLAY_SIZE = (320, 240)
+
+# USB cameras deliver MJPEG natively. Keep those JPEGs undecoded (OpenCV's
+# CONVERT_RGB off) and forward them untouched when there is nothing to draw.
+# Off until verified on the actual cameras/OpenCV build
+MJPEG_PASSTHROUGH = False
+
+# YOLO input size. Smaller than the 640x480 capture, so Ultralytics
+# letterboxes down once instead of padding up to 640
+YOLO_IMGSZ = 320
+
 # ======================================================
 # LOAD YOLO MODELS ON RPI
 # ======================================================
 
+# Intra-op threads per model. The scratch and brake models run side by side,
+# so each gets half the cores instead of both fighting over all of them
+INFER_THREADS = max(1, (os.cpu_count() or 4) // 2)
+torch.set_num_threads(INFER_THREADS)
+torch.set_num_interop_threads(1)
+
+# Models whose backend runs one image per call (Ultralytics' NCNN backend
+# only infers the first image of a batch)
+SINGLE_IMAGE_MODELS = set()
+
+def load_yolo(weights):
+    """Load YOLO weights as a cached NCNN export (fp16 NEON kernels), falling back to PyTorch"""
+    model = YOLO(weights)  # Raises if the weights are missing
+    target = Path(weights).with_name(f"{Path(weights).stem}_{YOLO_IMGSZ}_ncnn_model")
+    try:
+        if not target.exists():
+            print(f"🛠️  Exporting {weights} to NCNN (one-time, cached to {target})...")
+            Path(model.export(format="ncnn", imgsz=YOLO_IMGSZ, half=True)).replace(target)
+        exported = YOLO(str(target), task="detect")
+        SINGLE_IMAGE_MODELS.add(id(exported))
+        # Warm-up builds the NCNN net, whose thread count is only
+        # reachable afterwards (it defaults to every big core)
+        exported(np.zeros((YOLO_IMGSZ, YOLO_IMGSZ, 3), np.uint8), imgsz=YOLO_IMGSZ, verbose=False)
+        exported.predictor.model.net.opt.num_threads = INFER_THREADS
+        return exported
+    except Exception as e:
+        print(f"⚠️  NCNN export failed for {weights}, using PyTorch: {e}")
+        return model
+
 print("=" * 60)
 print("🔥 LOADING YOLO MODELS ON RPI...")
 print("=" * 60)
 
 # Model 1: Scratch/Dent detection (for front, left, right cameras)
 try:
-    MODEL_SCRATCH = YOLO("scratch_dent_model.pt")
+    MODEL_SCRATCH = load_yolo("scratch_dent_model.pt")
     print("✅ Scratch/Dent model loaded: scratch_dent_model.pt")
 except Exception as e:
     print(f"⚠️  Could not load scratch_dent_model.pt: {e}")
     print("   Trying fallback: best.pt")
     try:
-        MODEL_SCRATCH = YOLO("best.pt")
+        MODEL_SCRATCH = load_yolo("best.pt")
         print("✅ Fallback model loaded: best.pt")
     except:
         print("❌ No scratch/dent model found! Using YOLOv8n as placeholder")
@@ -47,28 +120,88 @@ except Exception as e:
 
 # Model 2: Brake shoe detection (for brake camera only)
 try:
-    MODEL_BRAKE = YOLO("brakeshoe_model.pt")
+    MODEL_BRAKE = load_yolo("brakeshoe_model.pt")
     print("✅ Brake shoe model loaded: brakeshoe_model.pt")
 except Exception as e:
     print(f"⚠️  Could not load brakeshoe_model.pt: {e}")
     print("   Trying fallback: brakes.pt")
     try:
-        MODEL_BRAKE = YOLO("brakes.pt")
+        MODEL_BRAKE = load_yolo("brakes.pt")
         print("✅ Fallback model loaded: brakes.pt")
     except:
         print("❌ No brake model found! Using scratch model as fallback")
         MODEL_BRAKE = MODEL_SCRATCH
 
+# Brake camera (3) uses the brake model; front/left/right the scratch model
+CAMERA_MODELS = (MODEL_SCRATCH, MODEL_SCRATCH, MODEL_SCRATCH, MODEL_BRAKE)
+
 print("=" * 60)
 print("✅ ALL MODELS LOADED!")
 print("=" * 60 + "\n")
 
+# ======================================================
+# JPEG ENCODER (libjpeg-turbo SIMD, OpenCV fallback)
+# ======================================================
+
+try:
+    JPEG = TurboJPEG() if TurboJPEG else None
+except Exception as e:
+    print(f"⚠️  libjpeg-turbo unavailable, using OpenCV JPEG encoder: {e}")
+    JPEG = None
+
+def encode_jpeg(frame, quality):
+    """Encode a BGR frame to a JPEG bytes-like object"""
+    if JPEG is not None:
+        return JPEG.encode(frame, quality=quality, jpeg_subsample=TJSAMP_420)
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return memoryview(buffer)  # requests writes it into the body without a .tobytes() copy
+
+# ======================================================
+# HTTP SESSION (keep-alive, shared by the sender threads)
+# ======================================================
+
+SESSION = requests.Session()
+# One host, one pooled connection per station so the concurrent POSTs never
+# wait on (or discard) a connection
+SESSION.mount(BASE_URL, HTTPAdapter(pool_connections=1, pool_maxsize=len(CAMERA_MAPPING)))
+
 # ======================================================
 # GLOBAL STATE
 # ======================================================
 
-camera_frames = {0: None, 1: None, 2: None, 3: None}
-frame_locks = {0: threading.Lock(), 1: threading.Lock(), 2: threading.Lock(), 3: threading.Lock()}
+# Triple buffering per camera without locks: camera_thread captures into its
+# own back buffer and publishes it, process_and_send hands its held buffer
+# back for reuse when it takes a newer frame. deque append/pop are atomic
+# under the GIL, so frames change hands by reference, never copied or locked
+FRAME_SHAPE = (480, 640, 3)
+latest_frames = {i: deque(maxlen=1) for i in range(4)}  # Newest untaken frame
+free_buffers = {i: deque() for i in range(4)}  # Buffers handed back for capture
+frame_ready = {0: False, 1: False, 2: False, 3: False}
+
+# Set by process_and_send when it wants another frame; camera_thread only
+# decodes (retrieve) while it is set and otherwise just grabs to stay current
+frame_wanted = {i: threading.Event() for i in range(4)}
+for event in frame_wanted.values():
+    event.set()
+
+def publish_frame(camera_id, frame):
+    """Publish a captured frame, returning a free buffer to capture into next"""
+    latest_frames[camera_id].append(frame)  # Replaces any frame not yet taken
+    frame_ready[camera_id] = True
+    try:
+        return free_buffers[camera_id].pop()
+    except IndexError:
+        return np.empty(FRAME_SHAPE, np.uint8)
+
+def take_frame(camera_id, held):
+    """Take the newest frame, handing held back for reuse (None if nothing new)"""
+    frame_wanted[camera_id].set()
+    try:
+        frame = latest_frames[camera_id].pop()
+    except IndexError:
+        return None
+    free_buffers[camera_id].append(held)
+    return frame
 
 # ======================================================
 # TEST BACKEND CONNECTION
@@ -78,7 +211,8 @@ def test_backend_connection():
     """Test if backend is reachable"""
     print(f"\n🔍 Testing connection to backend at {BASE_URL}...")
     try:
-        response = requests.get(f"{BASE_URL}/api/health", timeout=5)
+        # Through SESSION, so the first frames reuse this warm connection
+        response = SESSION.get(f"{BASE_URL}/api/health", timeout=5)
         if response.status_code == 200:
             print(f"✅ Backend connected successfully!")
             print(f"📡 Server status: {response.json()}")
@@ -104,15 +238,29 @@ def test_backend_connection():
 # CAMERA CAPTURE THREAD
 # ======================================================
 
+# Reconnect delay after a lost feed: doubles per failed attempt up to the max,
+# so a flaky USB camera is not re-initialised in a tight loop
+RECONNECT_DELAY = 0.5
+RECONNECT_DELAY_MAX = 5.0
+
+def open_camera(usb_index):
+    """Open a camera at 640x480/30fps with a single-frame driver buffer"""
+    cap = cv2.VideoCapture(usb_index)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    if MJPEG_PASSTHROUGH:
+        cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)  # retrieve() returns the raw JPEG
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap.set(cv2.CAP_PROP_FPS, 30)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
 def camera_thread(camera_id, usb_index, station_name):
     """Capture frames from a specific camera"""
     print(f"📹 Starting Camera {camera_id} ({station_name.upper()}) on USB {usb_index}")
     
     # Try to open camera
-    cap = cv2.VideoCapture(usb_index)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    cap.set(cv2.CAP_PROP_FPS, 30)
+    cap = open_camera(usb_index)
     
     if not cap.isOpened():
         print(f"❌ Failed to open Camera {camera_id} ({station_name.upper()}) on USB {usb_index}")
@@ -122,30 +270,39 @@ def camera_thread(camera_id, usb_index, station_name):
     print(f"✅ Camera {camera_id} ({station_name.upper()}) ready")
     
     frame_count = 0
+    back = np.empty(FRAME_SHAPE, np.uint8)
+    reconnect_delay = RECONNECT_DELAY
     
     while True:
         try:
-            ret, frame = cap.read()
+            # grab() blocks until the driver has the next frame, which paces
+            # this loop at the camera's frame rate without sleeping
+            ret = cap.grab()
+            if ret and not frame_wanted[camera_id].is_set():
+                continue
+            
+            # Decode straight into the back buffer (OpenCV reallocates it only
+            # if the camera ignored 640x480)
+            if ret:
+                ret, frame = cap.retrieve(back)
             if not ret:
-                print(f"⚠️  Camera {camera_id} ({station_name.upper()}): Lost feed. Reconnecting...")
+                if reconnect_delay == RECONNECT_DELAY:
+                    print(f"⚠️  Camera {camera_id} ({station_name.upper()}): Lost feed. Reconnecting...")
                 cap.release()
-                time.sleep(0.5)
-                cap = cv2.VideoCapture(usb_index)
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                cap.set(cv2.CAP_PROP_FPS, 30)
+                time.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, RECONNECT_DELAY_MAX)
+                cap = open_camera(usb_index)
                 continue
             
-            # Store frame in shared memory
-            with frame_locks[camera_id]:
-                camera_frames[camera_id] = frame.copy()
+            reconnect_delay = RECONNECT_DELAY
+            frame_wanted[camera_id].clear()
+            # Publish the frame; the buffer handed back is captured into next
+            back = publish_frame(camera_id, frame)
             
             frame_count += 1
             if frame_count % 300 == 0:
                 print(f"📊 Camera {camera_id} ({station_name.upper()}): {frame_count} frames captured")
             
-            time.sleep(0.03)
-            
         except Exception as e:
             print(f"❌ Camera {camera_id} ({station_name.upper()}): {e}")
             time.sleep(1)
@@ -156,95 +313,239 @@ def camera_thread(camera_id, usb_index, station_name):
 # YOLO PROCESSING AND SENDING
 # ======================================================
 
+# BGR box colour per class id (Ultralytics' palette), built once per model
+MODEL_COLORS = {
+    id(model): {cls: colors(cls, True) for cls in model.names}
+    for model in (MODEL_SCRATCH, MODEL_BRAKE)
+}
+
+# Counting buckets: GOOD is skipped, the rest map to detection_count columns
+BUCKET_GOOD, BUCKET_SCRATCH, BUCKET_DENT, BUCKET_CRACK = range(4)
+
+def build_class_buckets(names):
+    """Map each class id to its counting bucket, scanning the class names once"""
+    buckets = np.full(max(names) + 1 if names else 0, BUCKET_CRACK, dtype=np.uint8)
+    for cls, name in names.items():
+        label = name.lower().strip()
+        if "good" in label:
+            buckets[cls] = BUCKET_GOOD
+        elif "scratch" in label:
+            buckets[cls] = BUCKET_SCRATCH
+        elif "dent" in label:
+            buckets[cls] = BUCKET_DENT
+    return buckets
+
+MODEL_BUCKETS = {id(model): build_class_buckets(model.names) for model in (MODEL_SCRATCH, MODEL_BRAKE)}
+
+def count_detections(boxes, model):
+    """Count (scratches, dents, cracks) in a (N, 6) xyxy/conf/cls boxes array"""
+    buckets = MODEL_BUCKETS[id(model)][boxes[:, -1].astype(np.intp)]
+    return np.bincount(buckets, minlength=4)[BUCKET_SCRATCH:]
+
+def draw_boxes(img, boxes, model, scale=1.0):
+    """Draw boxes (scaled from frame to img coordinates) and labels onto img in place"""
+    names = model.names
+    palette = MODEL_COLORS[id(model)]
+    for x1, y1, x2, y2, conf, cls in boxes.tolist():
+        x1, y1, x2, y2, cls = int(x1 * scale), int(y1 * scale), int(x2 * scale), int(y2 * scale), int(cls)
+        color = palette.get(cls, (0, 0, 255))
+        cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
+        cv2.putText(img, f"{names.get(cls, '')} {conf:.2f}", (x1, max(y1 - 5, 12)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+    return img
+
+def run_model(model, batch):
+    """Run one model over a list of frames (frame by frame for single-image backends)"""
+    if id(model) in SINGLE_IMAGE_MODELS:
+        return [model(frame, imgsz=YOLO_IMGSZ, conf=0.25, verbose=False)[0] for frame in batch]
+    return model(batch, imgsz=YOLO_IMGSZ, conf=0.25, verbose=False)
+
+def is_encoded(frame):
+    """Whether a captured frame is raw MJPEG bytes (V4L2 returns those as a (1, N) array, not HxWx3 pixels)"""
+    return frame.ndim != 3
+
+def decode_frame(frame):
+    """BGR pixels for a captured frame"""
+    if not is_encoded(frame):
+        return frame
+    if JPEG is not None:
+        return JPEG.decode(frame.ravel())
+    return cv2.imdecode(frame.ravel(), cv2.IMREAD_COLOR)
+
+def frame_thumbnail(frame):
+    """32x32 BGR thumbnail of a captured frame, for change detection"""
+    if is_encoded(frame):
+        frame = cv2.imdecode(frame.ravel(), cv2.IMREAD_REDUCED_COLOR_8)  # 1/8-scale JPEG decode
+    return cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA)
+
+def send_jpeg(url, jpeg_bytes):
+    """POST JPEG bytes (or a memoryview of them) to a station's update endpoint"""
+    files = {'file': ('image.jpg', jpeg_bytes, 'image/jpeg')}
+    response = SESSION.post(
+        url,
+        files=files,
+        timeout=2
+    )
+    return response.status_code == 200
+
+# SENDER STAGE: one thread and one small queue per station, so encoding and
+# the POST overlap the next round of inference. Only a sender thread writes
+# its camera's slot in send_count/error_count
+SEND_QUEUE_SIZE = 2
+send_queues = {i: queue.Queue(maxsize=SEND_QUEUE_SIZE) for i in range(4)}
+send_count = np.zeros(4, np.int64)
+error_count = np.zeros(4, np.int64)
+
+def queue_frame(camera_id, payload):
+    """Queue JPEG bytes or a BGR frame for sending, dropping the oldest if full"""
+    q = send_queues[camera_id]
+    try:
+        q.put_nowait(payload)
+    except queue.Full:
+        try:
+            q.get_nowait()  # Stale frame: the dashboard only wants the newest
+        except queue.Empty:
+            pass
+        q.put_nowait(payload)
+
+def sender_loop(camera_id):
+    """Encode (if needed) and POST queued frames for one station"""
+    station_name = STATION_NAMES[camera_id]
+    url = UPDATE_URLS[camera_id]
+    q = send_queues[camera_id]
+    while True:
+        payload = q.get()
+        try:
+            jpeg_bytes = payload if isinstance(payload, bytes) else encode_jpeg(payload, 85)
+            if send_jpeg(url, jpeg_bytes):
+                send_count[camera_id] += 1
+            else:
+                error_count[camera_id] += 1
+        except requests.exceptions.Timeout:
+            error_count[camera_id] += 1
+        except requests.exceptions.ConnectionError:
+            error_count[camera_id] += 1
+        except Exception as e:
+            error_count[camera_id] += 1
+            if error_count[camera_id] % 50 == 1:
+                print(f"⚠️  {station_name.upper()}: Send error - {e}")
+
 def process_and_send():
     """Run YOLO on frames and send annotated images to backend"""
     print("🚀 Starting YOLO processing and frame sender...")
     
-    send_count = {0: 0, 1: 0, 2: 0, 3: 0}
-    error_count = {0: 0, 1: 0, 2: 0, 3: 0}
-    detection_count = {0: {"scratches": 0, "dents": 0, "cracks": 0}, 
-                       1: {"scratches": 0, "dents": 0, "cracks": 0},
-                       2: {"scratches": 0, "dents": 0, "cracks": 0},
-                       3: {"scratches": 0, "dents": 0, "cracks": 0}}
+    # Latest counts per camera; columns are scratches, dents, cracks
+    # (send/error counters live with the sender stage)
+    detection_count = np.zeros((4, 3), np.int64)
     last_status_time = time.time()
+    last_detected_ts = {0: 0.0, 1: 0.0, 2: 0.0, 3: 0.0}
+    last_boxes = {0: None, 1: None, 2: None, 3: None}  # (N, 6) arrays per camera
+    
+    # POSTs for all stations run concurrently, off this loop
+    for camera_id in CAMERA_MAPPING:
+        threading.Thread(target=sender_loop, args=(camera_id,), daemon=True).start()
+    
+    # The scratch and brake models run side by side; inference is native code
+    # that releases the GIL, so the two batches use separate cores
+    infer_pool = ThreadPoolExecutor(max_workers=2)
+    
+    # Buffers this loop holds until it swaps them for newer frames. Senders
+    # only get copies or fresh arrays, never one of these
+    held = {i: np.empty(FRAME_SHAPE, np.uint8) for i in range(4)}
+    has_frame = set()
+    
+    # Thumbnail and time of the last frame sent per camera (see CHANGE_THRESHOLD)
+    last_thumbs = {0: None, 1: None, 2: None, 3: None}
+    last_sent_ts = {0: 0.0, 1: 0.0, 2: 0.0, 3: 0.0}
     
     while True:
+        loop_start = time.monotonic()
         try:
+            # Take the latest frame from every camera (or keep the last one)
+            frames = {}
+            new_frames = set()
             for camera_id in [0, 1, 2, 3]:
-                station_name = CAMERA_MAPPING[camera_id][0]
-                
-                # Get frame
-                with frame_locks[camera_id]:
-                    frame = camera_frames[camera_id]
-                
-                if frame is None:
+                frame = take_frame(camera_id, held[camera_id])
+                if frame is not None:
+                    held[camera_id] = frame
+                    has_frame.add(camera_id)
+                    new_frames.add(camera_id)
+                if camera_id in has_frame:
+                    frames[camera_id] = held[camera_id]
+            
+            # Pixels are decoded lazily: only for YOLO or when boxes are drawn
+            pixels = {}
+            def frame_pixels(camera_id):
+                if camera_id not in pixels:
+                    pixels[camera_id] = decode_frame(frames[camera_id])
+                return pixels[camera_id]
+            
+            # Cameras with a new frame due a fresh detection (see TARGET_DET_FPS),
+            # grouped per model
+            now = time.time()
+            groups = {}
+            for camera_id in new_frames:
+                if last_boxes[camera_id] is None or now - last_detected_ts[camera_id] >= 1.0 / TARGET_DET_FPS:
+                    model = CAMERA_MODELS[camera_id]
+                    groups.setdefault(id(model), (model, []))[1].append(camera_id)
+            
+            # RUN YOLO INFERENCE ON RPI - one batched call per model, models in parallel
+            running = []
+            for model, cam_ids in groups.values():
+                try:
+                    batch = [frame_pixels(cid) for cid in cam_ids]
+                    running.append((model, cam_ids, infer_pool.submit(run_model, model, batch)))
+                except Exception as e:
+                    stations = ", ".join(STATION_NAMES[cid] for cid in cam_ids)
+                    print(f"⚠️  Decode error on {stations}: {e}")
+            
+            detected = set()
+            for model, cam_ids, future in running:
+                try:
+                    results = future.result()
+                    for camera_id, result in zip(cam_ids, results):
+                        detected.add(camera_id)
+                        # One host copy per result, shared by counting and drawing
+                        last_boxes[camera_id] = result.boxes.data.cpu().numpy()[:, [0, 1, 2, 3, -2, -1]]
+                        last_detected_ts[camera_id] = now
+                        detection_count[camera_id] = count_detections(last_boxes[camera_id], model)
+                except Exception as e:
+                    stations = ", ".join(STATION_NAMES[cid] for cid in cam_ids)
+                    print(f"⚠️  YOLO error on {stations}: {e}")
+            
+            # Annotate (redrawing the last boxes between detections) and queue
+            for camera_id, frame in frames.items():
+                # Skip unchanged scenes unless boxes changed or a heartbeat is due
+                heartbeat = now - last_sent_ts[camera_id] >= HEARTBEAT_SECONDS
+                if camera_id not in new_frames and camera_id not in detected and not heartbeat:
+                    continue
+                thumb = frame_thumbnail(frame)
+                previous = last_thumbs[camera_id]
+                if (camera_id not in detected and not heartbeat and previous is not None
+                        and cv2.norm(thumb, previous, cv2.NORM_L1) / thumb.size < CHANGE_THRESHOLD):
                     continue
+                last_thumbs[camera_id] = thumb
+                last_sent_ts[camera_id] = now
                 
-                # SELECT MODEL based on camera
-                if camera_id == 3:  # Brake camera
-                    model = MODEL_BRAKE
-                else:  # Front, Left, Right cameras
-                    model = MODEL_SCRATCH
+                boxes = last_boxes[camera_id]
+                has_boxes = boxes is not None and len(boxes) > 0
                 
-                # RUN YOLO INFERENCE ON RPI
-                try:
-                    results = model(frame, conf=0.25, verbose=False)
-                    annotated_frame = results[0].plot()
-                    
-                    # Count detections
-                    scratch_count = 0
-                    dent_count = 0
-                    crack_count = 0
-                    
-                    for result in results:
-                        for box in result.boxes:
-                            cls = int(box.cls.item())
-                            label = model.names.get(cls, "").lower()
-                            
-                            if "good" in label:
-                                continue
-                            elif "scratch" in label:
-                                scratch_count += 1
-                            elif "dent" in label:
-                                dent_count += 1
-                            else:
-                                crack_count += 1
-                    
-                    detection_count[camera_id] = {
-                        "scratches": scratch_count,
-                        "dents": dent_count,
-                        "cracks": crack_count
-                    }
-                    
-                except Exception as e:
-                    print(f"⚠️  YOLO error on {station_name}: {e}")
-                    annotated_frame = frame
+                # Nothing to draw on an MJPEG frame: forward the camera's JPEG
+                if is_encoded(frame) and not has_boxes:
+                    queue_frame(camera_id, frame.tobytes())
+                    continue
                 
-                # Encode annotated frame as JPEG
-                _, img_encoded = cv2.imencode('.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                # Downscale into a fresh display-size array (the sender owns
+                # it from here), then draw there: the source pixels stay
+                # untouched for the next detection
+                img = frame_pixels(camera_id)
+                annotated_frame = cv2.resize(img, DISPLAY_SIZE, interpolation=cv2.INTER_AREA)
+                if has_boxes:
+                    model = CAMERA_MODELS[camera_id]
+                    draw_boxes(annotated_frame, boxes, model, scale=DISPLAY_SIZE[0] / img.shape[1])
                 
                 # SEND TO STATION ENDPOINT (for multi-camera display)
-                try:
-                    files = {'file': ('image.jpg', img_encoded.tobytes(), 'image/jpeg')}
-                    response = requests.post(
-                        f"{BASE_URL}/api/update/{station_name}",
-                        files=files,
-                        timeout=2
-                    )
-                    
-                    if response.status_code == 200:
-                        send_count[camera_id] += 1
-                    else:
-                        error_count[camera_id] += 1
-                        
-                except requests.exceptions.Timeout:
-                    error_count[camera_id] += 1
-                except requests.exceptions.ConnectionError:
-                    error_count[camera_id] += 1
-                except Exception as e:
-                    error_count[camera_id] += 1
-                    if error_count[camera_id] % 50 == 1:
-                        print(f"⚠️  {station_name.upper()}: Send error - {e}")
+                queue_frame(camera_id, annotated_frame)
             
             # Print status every 30 seconds
             current_time = time.time()
@@ -252,20 +553,20 @@ def process_and_send():
                 print("\n" + "=" * 70)
                 print("📊 SYSTEM STATUS - YOLO RUNNING ON RPI")
                 print("=" * 70)
+                total = send_count + error_count
+                success_rate = np.divide(send_count * 100.0, total, out=np.zeros(4), where=total > 0)
                 for cam_id in [0, 1, 2, 3]:
-                    station = CAMERA_MAPPING[cam_id][0].upper()
+                    station = STATION_NAMES[cam_id].upper()
                     model_name = "BRAKE" if cam_id == 3 else "SCRATCH"
-                    total = send_count[cam_id] + error_count[cam_id]
-                    success_rate = (send_count[cam_id] / total * 100) if total > 0 else 0
-                    detections = detection_count[cam_id]
+                    scratches, dents, cracks = detection_count[cam_id]
                     print(f"{station:6} [{model_name:7}] | Sent: {send_count[cam_id]:4} | "
-                          f"Errors: {error_count[cam_id]:4} | Success: {success_rate:5.1f}% | "
-                          f"Detections: S={detections['scratches']} D={detections['dents']} C={detections['cracks']}")
+                          f"Errors: {error_count[cam_id]:4} | Success: {success_rate[cam_id]:5.1f}% | "
+                          f"Detections: S={scratches} D={dents} C={cracks}")
                 print("=" * 70 + "\n")
                 last_status_time = current_time
             
-            # Control processing rate
-            time.sleep(0.1)
+            # Control processing rate: sleep only for the rest of the period
+            time.sleep(max(0.0, LOOP_PERIOD - (time.monotonic() - loop_start)))
             
         except Exception as e:
             print(f"❌ Processing loop error: {e}")
@@ -309,7 +610,7 @@ if __name__ == "__main__":
     time.sleep(3)
     
     # Check cameras
-    ready_count = sum(1 for frame in camera_frames.values() if frame is not None)
+    ready_count = sum(frame_ready.values())
     print(f"\n✅ {ready_count}/4 cameras ready!")
     
     if ready_count == 0:
@@ -26,9 +26,10 @@ CAMERA MAPPING:
 
 BACKEND API CONTRACT (DO NOT MODIFY):
 - GET  /api/get-active-camera          → {"camera_id": int}
+- GET  /api/active-camera/stream       → SSE of {"camera_id": int} on change
 - POST /api/set-active-camera/{id}     → sets active camera
 - POST /api/analyze-image              → image analysis + upload
-- POST /api/update/{station}           → live feed ingestion
+- POST /api/update/{station}           → live feed ingestion (raw JPEG or multipart)
 - GET  /api/station-feed/{station}     → frontend retrieval
 
 PERFORMANCE TARGETS:
@@ -40,17 +41,35 @@ PERFORMANCE TARGETS:
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
+import os
 import cv2
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import threading
+import queue
 import numpy as np
+import torch
 from datetime import datetime
 from ultralytics import YOLO
+from ultralytics.utils.plotting import colors
 from typing import Optional, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import io
 import logging
 from pathlib import Path
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+try:
+    from picamera2 import Picamera2
+except ImportError:
+    Picamera2 = None
+try:
+    from orjson import loads as json_loads  # Parses bytes directly, ~3x stdlib
+except ImportError:
+    from json import loads as json_loads
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -60,28 +79,51 @@ class Config:
     """Centralized configuration - MODIFY THESE VALUES"""
     
     # Backend Configuration
-    BACKEND_URL = "http://localhost:8000"  # Change to your backend URL (HTTPS for production)
+    BACKEND_URL = "http://127.0.0.1:8000"  # Change to your backend URL (HTTPS for production); an IP skips name lookups
     SERVICE_RECORD_ID = "455e445f-c11b-4db7-8c78-e62f8df86614"  # Your service record ID
     
     # Camera Settings
-    CAMERA_POLL_INTERVAL = 0.3  # Poll backend every 300ms for active camera
+    CAMERA_POLL_INTERVAL = 0.3  # Fallback: poll every 300ms if the backend has no SSE stream
+    CAMERA_STREAM_TIMEOUT = 30.0  # Backend re-sends every 15s; silence this long = dead link
+    CAMERA_SWITCH_RETRY = 0.5  # Retry a switch to a camera whose grabber hasn't opened it yet
     NUM_CAMERAS = 4
+    CAMERA_WIDTH = 640
+    CAMERA_HEIGHT = 480
     CAMERA_WARMUP_FRAMES = 5  # Discard first N frames after opening camera
+    CSI_CAMERAS: Dict[int, int] = {}  # Camera ID → Picamera2 index for CSI modules, e.g. {3: 0}; the rest are USB
+    CAMERA_RECONNECT_DELAY = 0.5  # First retry after a camera fails to open
+    CAMERA_RECONNECT_DELAY_MAX = 5.0  # Backoff ceiling for a missing camera
     
     # YOLO Inference Settings
     YOLO_CONFIDENCE = 0.25
     YOLO_IOU = 0.45
     YOLO_IMG_SIZE = 640
     MAX_DETECTIONS = 50
+    YOLO_EXPORT_NCNN = True  # Run cached NCNN exports (ARM NEON) instead of PyTorch
+    INFERENCE_THREADS = 2  # Cores per inference (Pi 5 has 4; leaves room for capture/upload)
     
     # Image Processing
-    MAX_FRAME_WIDTH = 640
-    JPEG_QUALITY = 95
+    LETTERBOX_COLOR = 114  # Ultralytics' own padding value
+    JPEG_QUALITY = 95  # Captures sent for analysis/upload
+    LIVE_FEED_JPEG_QUALITY = 80  # Preview only - plenty for the dashboard
     
     # Performance Settings
     TARGET_FPS = 10
+    FEED_CHANGE_THRESHOLD = 2.0  # Mean abs diff (0-255) of a 32x32 thumbnail below which a frame is a repeat
+    FEED_HEARTBEAT_SECONDS = 2.0  # Push a repeat frame at least this often anyway
+    FPS_LOG_FRAMES = 40  # Log live-feed FPS every N pushed frames
+    STATS_INTERVAL = 60  # Seconds between pipeline stats logs (queue, drops, inference p50/p95)
     FRAME_TIMEOUT = 2.0  # Skip frame if processing takes longer
     
+    # Thread Placement (Pi 5: 4 cores) - grabbers get a core to themselves
+    # so frame readout isn't preempted by inference; SCHED_FIFO needs
+    # CAP_SYS_NICE (systemd: AmbientCapabilities=CAP_SYS_NICE), else skipped
+    CPU_PINNING_ENABLED = True
+    GRABBER_CORES = {0}
+    INFERENCE_CORES = {1, 2}
+    UPLOAD_CORES = {3}
+    GRABBER_FIFO_PRIORITY = 10  # 0 = keep the default scheduler
+    
     # Auto-Capture Mode
     AUTO_CAPTURE_ENABLED = True  # Set to False to disable auto-capture
     AUTO_CAPTURE_INTERVAL = 10  # Seconds between auto-captures per camera
@@ -125,92 +167,230 @@ STATION_MODEL_MAP = {
 }
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# THREAD PLACEMENT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def pin_current_thread(cores: set, fifo_priority: int = 0):
+    """Pin the calling thread to cores and optionally make it SCHED_FIFO (Linux only)"""
+    if not Config.CPU_PINNING_ENABLED or not hasattr(os, "sched_setaffinity"):
+        return
+    
+    cores = cores & os.sched_getaffinity(0)
+    if cores:
+        os.sched_setaffinity(0, cores)  # pid 0 = this thread
+    
+    if fifo_priority:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(fifo_priority))
+        except PermissionError:
+            logger.debug(f"SCHED_FIFO needs CAP_SYS_NICE; {threading.current_thread().name} keeps default scheduling")
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CAMERA MANAGER
 # ═══════════════════════════════════════════════════════════════════════════
 
+class CSICamera:
+    """Picamera2 capture exposing the grab()/retrieve()/release() subset of cv2.VideoCapture"""
+    
+    def __init__(self, index: int):
+        self.camera = Picamera2(index)
+        # RGB888 is laid out [B, G, R] in memory - OpenCV's BGR, no convert
+        self.camera.configure(self.camera.create_video_configuration(
+            main={"format": "RGB888", "size": (Config.CAMERA_WIDTH, Config.CAMERA_HEIGHT)},
+            controls={"FrameRate": Config.TARGET_FPS},
+            buffer_count=4
+        ))
+        self.camera.start()
+        self._request = None
+    
+    def grab(self) -> bool:
+        """Wait for the next frame and hold its buffer (no pixel copy)"""
+        if self._request is not None:
+            self._request.release()
+            self._request = None
+        try:
+            self._request = self.camera.capture_request()
+        except Exception as e:
+            logger.debug(f"CSI capture failed: {e}")
+            return False
+        return True
+    
+    def retrieve(self) -> Tuple[bool, np.ndarray]:
+        """Copy the held frame out of its DMA buffer"""
+        return True, self._request.make_array("main")
+    
+    def release(self):
+        """Return the held buffer and close the camera"""
+        if self._request is not None:
+            self._request.release()
+            self._request = None
+        self.camera.stop()
+        self.camera.close()
+
+
 class CameraManager:
-    """Handles dynamic camera opening/closing with USB hot-plug support"""
+    """Keeps every camera open with USB hot-plug support; switching is just a pointer change"""
     
     def __init__(self):
-        self.active_camera: Optional[cv2.VideoCapture] = None
+        self.caps: Dict[int, object] = {}  # cv2.VideoCapture (USB) or CSICamera
         self.active_camera_id: Optional[int] = None
         self.lock = threading.Lock()
         
-    def open_camera(self, camera_id: int) -> bool:
+        # One grabber thread per camera fills that camera's latest-frame slot,
+        # so consumers never contend on a capture device. Each grabber owns
+        # its device: only it opens, reads, reopens and releases it.
+        # Slots hold (monotonic capture time, frame); read_frame skips frames
+        # older than one frame period, so a frame left over from an earlier
+        # wait is never handed out as a new one
+        self._latest_frames: Dict[int, Optional[Tuple[float, np.ndarray]]] = {i: None for i in range(Config.NUM_CAMERAS)}
+        self._max_frame_age = 1.0 / Config.TARGET_FPS
+        self._wanted: Dict[int, int] = {i: 0 for i in range(Config.NUM_CAMERAS)}
+        self._frame_cv = threading.Condition()
+        self._running = True
+        self._grabbers = [
+            threading.Thread(target=self._grab_loop, args=(camera_id,), daemon=True)
+            for camera_id in range(Config.NUM_CAMERAS)
+        ]
+        for grabber in self._grabbers:
+            grabber.start()
+    
+    @staticmethod
+    def _open_device(camera_id: int):
         """
         Open camera with error handling and warmup
-        Returns: True if successful, False otherwise
+        Returns: Opened capture (cv2.VideoCapture or CSICamera), or None if failed
         """
-        with self.lock:
-            # Don't reopen if already active
-            if self.active_camera_id == camera_id and self.active_camera is not None:
-                if self.active_camera.isOpened():
-                    logger.debug(f"Camera {camera_id} already open")
-                    return True
+        logger.info(f"📹 Opening camera {camera_id} ({CAMERA_STATION_MAP.get(camera_id, 'unknown')} station)")
+        
+        try:
+            # CSI modules go through libcamera directly, skipping OpenCV's
+            # V4L2 path and its per-frame copy
+            if camera_id in Config.CSI_CAMERAS:
+                if Picamera2 is None:
+                    logger.error(f"❌ Camera {camera_id} is CSI but picamera2 is not installed")
+                    return None
+                cap = CSICamera(Config.CSI_CAMERAS[camera_id])
+                for _ in range(Config.CAMERA_WARMUP_FRAMES):
+                    cap.grab()
+                logger.info(f"✅ Camera {camera_id} opened successfully (CSI)")
+                return cap
             
-            # Release previous camera
-            self._release_camera()
+            cap = cv2.VideoCapture(camera_id)
             
-            # Open new camera
-            logger.info(f"📹 Opening camera {camera_id} ({CAMERA_STATION_MAP.get(camera_id, 'unknown')} station)")
+            if not cap.isOpened():
+                logger.error(f"❌ Failed to open camera {camera_id}")
+                return None
             
-            try:
-                cap = cv2.VideoCapture(camera_id)
-                
-                if not cap.isOpened():
-                    logger.error(f"❌ Failed to open camera {camera_id}")
-                    return False
-                
-                # Configure camera for best performance
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                cap.set(cv2.CAP_PROP_FPS, Config.TARGET_FPS)
-                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimize latency
-                
-                # Warmup: discard first few frames (often corrupted)
-                for _ in range(Config.CAMERA_WARMUP_FRAMES):
-                    cap.read()
-                
-                self.active_camera = cap
-                self.active_camera_id = camera_id
-                
-                logger.info(f"✅ Camera {camera_id} opened successfully")
-                return True
-                
-            except Exception as e:
-                logger.error(f"❌ Exception opening camera {camera_id}: {e}")
-                return False
+            # Configure camera for best performance (MJPEG keeps USB
+            # bandwidth low enough for all cameras at 640x480)
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, Config.CAMERA_WIDTH)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, Config.CAMERA_HEIGHT)
+            cap.set(cv2.CAP_PROP_FPS, Config.TARGET_FPS)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimize latency
+            
+            # Warmup: discard first few frames (often corrupted) - grab()
+            # dequeues them without paying for the decode
+            for _ in range(Config.CAMERA_WARMUP_FRAMES):
+                cap.grab()
+            
+            logger.info(f"✅ Camera {camera_id} opened successfully")
+            return cap
+            
+        except Exception as e:
+            logger.error(f"❌ Exception opening camera {camera_id}: {e}")
+            return None
     
-    def read_frame(self) -> Optional[np.ndarray]:
+    def _grab_loop(self, camera_id: int):
+        """Internal: Keep one camera open and its slot holding the freshest frame"""
+        pin_current_thread(Config.GRABBER_CORES, Config.GRABBER_FIFO_PRIORITY)
+        cap = None
+        delay = Config.CAMERA_RECONNECT_DELAY
+        
+        while self._running:
+            if cap is None:
+                cap = self._open_device(camera_id)
+                if cap is None:
+                    time.sleep(delay)
+                    delay = min(delay * 2, Config.CAMERA_RECONNECT_DELAY_MAX)
+                    continue
+                delay = Config.CAMERA_RECONNECT_DELAY
+                with self.lock:
+                    self.caps[camera_id] = cap
+            
+            # Always grab to keep the device buffer fresh; only decode when
+            # the frame can actually be used
+            ret, frame = cap.grab(), None
+            if ret and (camera_id == self.active_camera_id or self._wanted[camera_id]):
+                ret, frame = cap.retrieve()
+                if ret and frame is not None:
+                    with self._frame_cv:
+                        self._latest_frames[camera_id] = (time.monotonic(), frame)
+                        self._frame_cv.notify_all()
+            
+            if not ret:
+                logger.warning(f"⚠️ Failed to read from camera {camera_id}, reopening")
+                with self.lock:
+                    self.caps.pop(camera_id, None)
+                cap.release()
+                cap = None
+        
+        if cap is not None:
+            cap.release()
+    
+    def open_camera(self, camera_id: int) -> bool:
         """
-        Read frame from active camera
-        Returns: Frame as numpy array, or None if failed
+        Make camera the active one (no device I/O - every camera stays open)
+        Returns: True if the camera is open, False otherwise
         """
         with self.lock:
-            if self.active_camera is None or not self.active_camera.isOpened():
-                return None
-            
-            ret, frame = self.active_camera.read()
+            if camera_id not in self.caps:
+                logger.warning(f"⚠️ Camera {camera_id} is not open")
+                return False
             
-            if not ret or frame is None:
-                logger.warning(f"⚠️ Failed to read from camera {self.active_camera_id}")
+            if camera_id != self.active_camera_id:
+                # Flush whatever both slots held: the camera being left stops
+                # refreshing its slot, and the new one's is from an earlier read
+                with self._frame_cv:
+                    self._latest_frames[camera_id] = None
+                    if self.active_camera_id is not None:
+                        self._latest_frames[self.active_camera_id] = None
+                self.active_camera_id = camera_id
+            return True
+    
+    def read_frame(self, camera_id: Optional[int] = None, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Take the freshest frame from a camera (the active one by default)
+        Returns: Frame as numpy array, or None if none arrived within timeout
+        """
+        if camera_id is None:
+            camera_id = self.active_camera_id
+            if camera_id is None:
                 return None
-            
-            return frame
-    
-    def _release_camera(self):
-        """Internal: Release active camera"""
-        if self.active_camera is not None:
-            logger.debug(f"Releasing camera {self.active_camera_id}")
-            self.active_camera.release()
-            self.active_camera = None
-            self.active_camera_id = None
+        
+        def fresh() -> bool:
+            slot = self._latest_frames[camera_id]
+            return slot is not None and time.monotonic() - slot[0] <= self._max_frame_age
+        
+        with self._frame_cv:
+            self._wanted[camera_id] += 1
+            try:
+                ok = self._frame_cv.wait_for(fresh, timeout=timeout)
+            finally:
+                self._wanted[camera_id] -= 1
+            slot, self._latest_frames[camera_id] = self._latest_frames[camera_id], None
+            return slot[1] if ok else None
     
     def release(self):
-        """Public method to release camera"""
+        """Stop the grabbers, which release their cameras"""
+        self._running = False
+        for grabber in self._grabbers:
+            grabber.join(timeout=2.0)
         with self.lock:
-            self._release_camera()
+            self.caps.clear()
+            self.active_camera_id = None
     
     def get_active_id(self) -> Optional[int]:
         """Get currently active camera ID"""
@@ -228,23 +408,102 @@ class YOLOEngine:
     def __init__(self):
         logger.info("⏳ Loading YOLO models...")
         
+        # Cap intra-op threads so inference doesn't take every core
+        torch.set_num_threads(Config.INFERENCE_THREADS)
+        cv2.setNumThreads(Config.INFERENCE_THREADS)
+        
         try:
-            self.damage_model = YOLO(Config.DAMAGE_MODEL_PATH)
+            self.damage_model = self._load_model(Config.DAMAGE_MODEL_PATH)
             logger.info(f"✅ Loaded damage model: {Config.DAMAGE_MODEL_PATH}")
         except Exception as e:
             logger.error(f"❌ Failed to load damage model: {e}")
             raise
         
         try:
-            self.brake_model = YOLO(Config.BRAKE_MODEL_PATH)
+            self.brake_model = self._load_model(Config.BRAKE_MODEL_PATH)
             logger.info(f"✅ Loaded brake model: {Config.BRAKE_MODEL_PATH}")
         except Exception as e:
             logger.error(f"❌ Failed to load brake model: {e}")
             raise
         
         logger.info("✅ All YOLO models loaded successfully")
+        
+        # Class id → damage kind lookup, resolved from the label strings once
+        self.damage_kinds = self._build_kind_table(self.damage_model.names)
+        self.brake_kinds = self._build_kind_table(self.brake_model.names)
+        
+        # Normalized RGB NCHW model input, allocated once and reused for
+        # every frame. Letterbox geometry is fixed per camera frame shape, so
+        # it (and the padding) is only computed when the shape changes.
+        size = Config.YOLO_IMG_SIZE
+        self._input = np.zeros((1, 3, size, size), dtype=np.float32)
+        self._input_tensor = torch.from_numpy(self._input)  # Shares memory
+        self._frame_shape: Optional[Tuple[int, int]] = None
+        self._content: Optional[Tuple[int, int, int, int]] = None  # (top, left, height, width)
+        self._interpolation: Optional[int] = None  # None = frame already fits
+        self._frame: Optional[np.ndarray] = None  # Last preprocessed BGR frame, for annotate()
+        
+        # Warm-up builds each predictor; an NCNN net's thread count is only
+        # reachable afterwards (it defaults to every core). It also spawns the
+        # OpenMP worker pools, which inherit this thread's CPU affinity - so
+        # run it pinned to the inference cores, then restore the caller.
+        caller_cores = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+        pin_current_thread(Config.INFERENCE_CORES)
+        for model in (self.damage_model, self.brake_model):
+            model(self._input_tensor, imgsz=size, verbose=False)
+            backend = model.predictor.model
+            if getattr(backend, "ncnn", False):
+                backend.net.opt.num_threads = Config.INFERENCE_THREADS
+        if caller_cores:
+            os.sched_setaffinity(0, caller_cores)
     
-    def infer(self, frame: np.ndarray, station: str) -> Tuple[np.ndarray, int, int, int]:
+    @staticmethod
+    def _build_kind_table(names: Dict[int, str]) -> np.ndarray:
+        """
+        Map each class id to 0=good/ignored, 1=scratch, 2=dent, 3=crack/other
+        Returns: int8 lookup table indexed by class id
+        """
+        table = np.zeros(max(names, default=-1) + 1, dtype=np.int8)
+        for cls, label in names.items():
+            label = label.lower().strip()
+            if "good" in label:
+                continue
+            if "scratch" in label:
+                table[cls] = 1
+            elif "dent" in label:
+                table[cls] = 2
+            else:
+                table[cls] = 3
+        return table
+    
+    @staticmethod
+    def _load_model(weights: str) -> YOLO:
+        """
+        Load weights as a cached NCNN export, falling back to PyTorch
+        Returns: YOLO model ready for inference
+        """
+        model = YOLO(weights)  # Raises if the weights are missing
+        if not Config.YOLO_EXPORT_NCNN:
+            return model
+        
+        target = Path(weights).with_name(f"{Path(weights).stem}_{Config.YOLO_IMG_SIZE}_ncnn_model")
+        try:
+            if not target.exists():
+                logger.info(f"🛠️ Exporting {weights} to NCNN (one-time, cached to {target})...")
+                exported = model.export(format="ncnn", imgsz=Config.YOLO_IMG_SIZE, half=True)
+                Path(exported).replace(target)
+            return YOLO(str(target), task="detect")
+        except Exception as e:
+            logger.warning(f"⚠️ NCNN export failed for {weights}, using PyTorch: {e}")
+            return model
+    
+    def _select_model(self, station: str) -> Tuple[YOLO, np.ndarray]:
+        """Model and class-kind table for a station"""
+        if station == "brake":
+            return self.brake_model, self.brake_kinds
+        return self.damage_model, self.damage_kinds
+    
+    def infer(self, frame: np.ndarray, station: str) -> Tuple[np.ndarray, Tuple[int, int, int]]:
         """
         Run YOLO inference on frame
         
@@ -253,64 +512,89 @@ class YOLOEngine:
             station: Station name to determine model
         
         Returns:
-            Tuple of (annotated_frame, scratch_count, dent_count, crack_count)
+            Tuple of (detections, (scratch_count, dent_count, crack_count)),
+            detections being an (N, 6) array of x1, y1, x2, y2, conf, cls
         """
-        # Select model based on station
-        model = self.brake_model if station == "brake" else self.damage_model
+        model, kinds = self._select_model(station)
         
-        # Resize frame for inference
-        resized_frame = self._resize_frame(frame)
+        # Letterbox + normalize ourselves; a tensor input skips Ultralytics'
+        # own preprocessing
+        self._preprocess(frame)
         
         # Run inference
         results = model(
-            resized_frame,
+            self._input_tensor,
             conf=Config.YOLO_CONFIDENCE,
             iou=Config.YOLO_IOU,
             agnostic_nms=True,
-            half=True,
             verbose=False,
             max_det=Config.MAX_DETECTIONS,
             imgsz=Config.YOLO_IMG_SIZE
         )
+        detections = results[0].boxes.data.cpu().numpy()
         
-        # Count detections
-        scratch_count = 0
-        dent_count = 0
-        crack_count = 0
+        # Count detections per damage kind in one vectorized pass
+        counts = np.bincount(kinds[detections[:, 5].astype(np.int32)], minlength=4)
         
-        for result in results:
-            for box in result.boxes:
-                cls = int(box.cls.item())
-                label = model.names.get(cls, "").lower().strip()
-                
-                if "good" in label:
-                    continue
-                
-                if "scratch" in label:
-                    scratch_count += 1
-                elif "dent" in label:
-                    dent_count += 1
-                else:
-                    crack_count += 1
+        return detections, (int(counts[1]), int(counts[2]), int(counts[3]))
+    
+    def annotate(self, detections: np.ndarray, station: str) -> np.ndarray:
+        """
+        Draw detections from the last infer() onto a copy of its (resized) frame
         
-        # Generate annotated frame
-        annotated_frame = results[0].plot()
+        Args:
+            detections: Boxes returned by infer()
+            station: Station name to determine class names
         
-        return annotated_frame, scratch_count, dent_count, crack_count
+        Returns: Annotated BGR frame, letterbox padding removed
+        """
+        names = self._select_model(station)[0].names
+        top, left = self._content[:2]
+        img = self._frame.copy()
+        
+        # Plain rectangles + labels; Ultralytics' plot() also handles masks,
+        # keypoints and custom fonts, none of which apply here
+        for x1, y1, x2, y2, conf, cls in detections.tolist():
+            x1, y1, x2, y2, cls = int(x1) - left, int(y1) - top, int(x2) - left, int(y2) - top, int(cls)
+            color = colors(cls, True)
+            cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
+            cv2.putText(img, f"{names.get(cls, '')} {conf:.2f}", (x1, max(y1 - 5, 12)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+        return img
     
-    @staticmethod
-    def _resize_frame(frame: np.ndarray) -> np.ndarray:
-        """Resize frame to max dimension while preserving aspect ratio"""
-        h, w = frame.shape[:2]
-        max_dim = Config.MAX_FRAME_WIDTH
+    def _set_geometry(self, shape: Tuple[int, int]):
+        """Internal: Compute letterbox placement for a frame shape and re-pad the input"""
+        size = Config.YOLO_IMG_SIZE
+        h, w = shape
+        if shape != (Config.CAMERA_HEIGHT, Config.CAMERA_WIDTH):
+            logger.warning(f"⚠️ Camera delivers {w}x{h}, not the configured "
+                           f"{Config.CAMERA_WIDTH}x{Config.CAMERA_HEIGHT}")
         
-        if max(h, w) > max_dim:
-            scale = max_dim / max(h, w)
-            new_w = int(w * scale)
-            new_h = int(h * scale)
-            return cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LANCZOS4)
+        scale = size / max(h, w)
+        new_w, new_h = round(w * scale), round(h * scale)
+        self._content = ((size - new_h) // 2, (size - new_w) // 2, new_h, new_w)
+        if (new_w, new_h) == (w, h):
+            self._interpolation = None  # 640x480 → 640x640: padding only
+        else:
+            self._interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        
+        # Padding never changes between frames: write it once here
+        self._input.fill(Config.LETTERBOX_COLOR / 255)
+        self._frame_shape = shape
+    
+    def _preprocess(self, frame: np.ndarray):
+        """Letterbox frame into the model input (RGB, NCHW, 0-1)"""
+        if frame.shape[:2] != self._frame_shape:
+            self._set_geometry(frame.shape[:2])
+        top, left, h, w = self._content
         
-        return frame
+        if self._interpolation is not None:
+            frame = cv2.resize(frame, (w, h), interpolation=self._interpolation)
+        self._frame = frame
+        
+        # BGR→RGB, HWC→CHW and /255 in one pass per channel, image area only
+        for c in range(3):
+            np.multiply(frame[:, :, 2 - c], 1 / 255, out=self._input[0, c, top:top + h, left:left + w])
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -323,8 +607,71 @@ class BackendClient:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'RPi5-MultiCam-Agent/1.0'
+            'User-Agent': 'RPi5-MultiCam-Agent/1.0',
+            'Connection': 'keep-alive'
         })
+        
+        # Small keep-alive pool for the one backend host; no urllib3 retries
+        # (a failed live-feed push is simply superseded by the next frame)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, pool_block=False, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Endpoint URLs built once instead of per request
+        self._active_camera_url = f"{Config.BACKEND_URL}/api/get-active-camera"
+        self._active_camera_stream_url = f"{Config.BACKEND_URL}/api/active-camera/stream"
+        self._live_url_tpl = Config.BACKEND_URL + "/api/update/{}"
+        self._capture_url = f"{Config.BACKEND_URL}/api/analyze-image"
+        
+        # /api/analyze-image multipart body, pre-encoded: only camera_id and
+        # the JPEG vary, so every other part is built once per flag combination
+        boundary = os.urandom(16).hex()
+        self._form_boundary = boundary.encode()
+        self._capture_headers = {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+        self._capture_tails = {
+            (is_manual, should_upload): (
+                b"\r\n"
+                + self._form_field("is_manual", str(is_manual).lower())
+                + self._form_field("should_upload", str(should_upload).lower())
+                + self._form_field("service_record_id", Config.SERVICE_RECORD_ID)
+                + b"--" + self._form_boundary + b"--\r\n"
+            )
+            for is_manual in (False, True)
+            for should_upload in (False, True)
+        }
+        self._capture_file_header = (
+            b"--" + self._form_boundary + b"\r\n"
+            b'Content-Disposition: form-data; name="file"; filename="capture.jpg"\r\n'
+            b"Content-Type: image/jpeg\r\n\r\n"
+        )
+        
+        # Pay the TCP handshake once at startup
+        try:
+            self.session.get(self._active_camera_url, timeout=1.0)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"⚠️ Backend not reachable yet: {e}")
+        
+        # libjpeg-turbo (NEON SIMD on the Pi) when available, OpenCV otherwise
+        self._jpeg = None
+        if TurboJPEG is not None:
+            try:
+                self._jpeg = TurboJPEG()
+            except Exception as e:
+                logger.warning(f"⚠️ libjpeg-turbo unavailable, using OpenCV JPEG encoder: {e}")
+    
+    def _form_field(self, name: str, value: str) -> bytes:
+        """One encoded multipart form field, including its leading boundary"""
+        return (
+            b"--" + self._form_boundary + b"\r\n"
+            + f'Content-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    
+    def _encode_jpeg(self, frame: np.ndarray, quality: int) -> bytes:
+        """Encode a BGR frame to JPEG bytes"""
+        if self._jpeg is not None:
+            return self._jpeg.encode(frame, quality=quality, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+        _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return buffer.tobytes()
     
     def get_active_camera(self) -> Optional[int]:
         """
@@ -333,13 +680,12 @@ class BackendClient:
         """
         try:
             response = self.session.get(
-                f"{Config.BACKEND_URL}/api/get-active-camera",
+                self._active_camera_url,
                 timeout=1.0
             )
             
             if response.status_code == 200:
-                data = response.json()
-                return data.get("camera_id")
+                return json_loads(response.content).get("camera_id")
             
             logger.warning(f"⚠️ Backend returned status {response.status_code}")
             return None
@@ -348,6 +694,22 @@ class BackendClient:
             logger.debug(f"Backend poll failed: {e}")
             return None
     
+    def stream_active_camera(self):
+        """
+        Follow the backend's Server-Sent Events stream of active camera IDs
+        Yields: Camera ID on connect, on every change and on keep-alives
+        Raises: requests.exceptions.RequestException if the stream fails
+        """
+        with self.session.get(
+            self._active_camera_stream_url,
+            stream=True,
+            timeout=(2.0, Config.CAMERA_STREAM_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line.startswith(b"data:"):
+                    yield json_loads(line[5:]).get("camera_id")
+    
     def push_live_feed(self, station: str, annotated_frame: np.ndarray) -> bool:
         """
         Push annotated frame to backend (non-blocking)
@@ -360,18 +722,14 @@ class BackendClient:
         """
         try:
             # Encode frame to JPEG
-            _, buffer = cv2.imencode(
-                ".jpg",
-                annotated_frame,
-                [cv2.IMWRITE_JPEG_QUALITY, Config.JPEG_QUALITY]
-            )
-            
-            # Send to backend
-            files = {'file': ('frame.jpg', buffer.tobytes(), 'image/jpeg')}
+            jpeg_bytes = self._encode_jpeg(annotated_frame, Config.LIVE_FEED_JPEG_QUALITY)
             
+            # Send to backend as a raw JPEG body - no multipart body to build
+            # (one less copy of the frame per push)
             response = self.session.post(
-                f"{Config.BACKEND_URL}/api/update/{station}",
-                files=files,
+                self._live_url_tpl.format(station),
+                data=jpeg_bytes,
+                headers={'Content-Type': 'image/jpeg'},
                 timeout=2.0
             )
             
@@ -406,25 +764,20 @@ class BackendClient:
         """
         try:
             # Encode frame
-            _, buffer = cv2.imencode(
-                ".jpg",
-                frame,
-                [cv2.IMWRITE_JPEG_QUALITY, Config.JPEG_QUALITY]
-            )
+            jpeg_bytes = self._encode_jpeg(frame, Config.JPEG_QUALITY)
             
-            # Prepare multipart form data
-            files = {'file': ('capture.jpg', buffer.tobytes(), 'image/jpeg')}
-            data = {
-                'camera_id': camera_id,
-                'is_manual': str(is_manual).lower(),
-                'should_upload': str(should_upload).lower(),
-                'service_record_id': Config.SERVICE_RECORD_ID
-            }
+            # Assemble the multipart body from the pre-encoded parts
+            body = b"".join((
+                self._form_field("camera_id", str(camera_id)),
+                self._capture_file_header,
+                jpeg_bytes,
+                self._capture_tails[(bool(is_manual), bool(should_upload))]
+            ))
             
             response = self.session.post(
-                f"{Config.BACKEND_URL}/api/analyze-image",
-                files=files,
-                data=data,
+                self._capture_url,
+                data=body,
+                headers=self._capture_headers,
                 timeout=5.0
             )
             
@@ -454,12 +807,39 @@ class LiveFeedStreamer(threading.Thread):
         self.backend_client = backend_client
         self.running = False
         self.fps_counter = 0
-        self.last_fps_time = time.time()
+        self.last_fps_ns = time.monotonic_ns()
+        
+        # Pipeline stats, logged and reset every STATS_INTERVAL
+        self._inference_ns: Dict[str, list] = {}
+        self._dropped = 0
+        self._repeats = 0
+        self._next_stats_ns = self.last_fps_ns + Config.STATS_INTERVAL * 1_000_000_000
+        
+        # Thumbnail and time of the last pushed frame per station, for
+        # skipping repeats of an unchanged scene (idle bay)
+        self._last_thumbs: Dict[str, np.ndarray] = {}
+        self._last_push: Dict[str, float] = {}
+        
+        # Encode + POST run on their own thread so the network round-trip
+        # overlaps the next inference instead of adding to it
+        self._upload_q = queue.Queue(maxsize=2)
+        self._upload_thread = threading.Thread(target=self._uploader, daemon=True)
+        self._upload_thread.start()
+    
+    def _uploader(self):
+        """Push queued annotated frames to the backend"""
+        pin_current_thread(Config.UPLOAD_CORES)
+        while True:
+            station, annotated_frame = self._upload_q.get()
+            self.backend_client.push_live_feed(station, annotated_frame)
     
     def run(self):
         """Main streaming loop"""
         logger.info("🎥 Live feed streamer started")
+        pin_current_thread(Config.INFERENCE_CORES)
         self.running = True
+        frame_budget = 1.0 / Config.TARGET_FPS
+        next_deadline = time.monotonic()
         
         while self.running:
             try:
@@ -474,40 +854,96 @@ class LiveFeedStreamer(threading.Thread):
                     time.sleep(0.1)
                     continue
                 
-                # Read frame
+                # Read frame (always the freshest, whatever inference took)
                 frame = self.camera_manager.read_frame()
                 if frame is None:
                     time.sleep(0.1)
                     continue
                 
-                # YOLO inference
-                start_time = time.time()
-                annotated_frame, _, _, _ = self.yolo_engine.infer(frame, station)
-                inference_time = time.time() - start_time
-                
-                # Push to backend (non-blocking)
-                self.backend_client.push_live_feed(station, annotated_frame)
+                # Same pixels give the same detections: skip inference,
+                # encode and upload until the scene changes or a heartbeat
+                # is due (the backend keeps serving the last frame meanwhile)
+                if self._is_repeat(station, frame):
+                    self._repeats += 1
+                else:
+                    # YOLO inference
+                    start_ns = time.perf_counter_ns()
+                    detections, _ = self.yolo_engine.infer(frame, station)
+                    self._inference_ns.setdefault(station, []).append(time.perf_counter_ns() - start_ns)
+                    annotated_frame = self.yolo_engine.annotate(detections, station)
+                    
+                    # Hand off to the uploader; drop the frame rather than
+                    # stall inference when uploads fall behind
+                    try:
+                        self._upload_q.put_nowait((station, annotated_frame))
+                    except queue.Full:
+                        self._dropped += 1
+                    
+                    # FPS calculation
+                    self._update_fps()
                 
-                # FPS calculation
-                self._update_fps()
+                if time.monotonic_ns() >= self._next_stats_ns:
+                    self._log_stats()
                 
-                # Respect target FPS
-                sleep_time = max(0, (1.0 / Config.TARGET_FPS) - inference_time)
-                time.sleep(sleep_time)
+                # Respect target FPS on a fixed schedule, so a slow frame is
+                # made up by the next one; if a whole period behind, restart
+                # the schedule rather than bursting to catch up
+                next_deadline += frame_budget
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_deadline = time.monotonic()
                 
             except Exception as e:
                 logger.error(f"❌ Live feed error: {e}")
                 time.sleep(0.5)
     
+    def _is_repeat(self, station: str, frame: np.ndarray) -> bool:
+        """
+        Compare frame with the station's last pushed frame via 32x32 thumbnails
+        Returns: True to skip it, False if it should be pushed (and is recorded)
+        """
+        thumb = cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA)
+        previous = self._last_thumbs.get(station)
+        now = time.monotonic()
+        
+        if (previous is not None
+                and now - self._last_push[station] < Config.FEED_HEARTBEAT_SECONDS
+                and cv2.norm(thumb, previous, cv2.NORM_L1) / thumb.size < Config.FEED_CHANGE_THRESHOLD):
+            return True
+        
+        self._last_thumbs[station] = thumb
+        self._last_push[station] = now
+        return False
+    
     def _update_fps(self):
-        """Calculate and log FPS"""
+        """Count a pushed frame; every FPS_LOG_FRAMES frames, log FPS (integer math)"""
         self.fps_counter += 1
+        if self.fps_counter < Config.FPS_LOG_FRAMES:
+            return
         
-        if time.time() - self.last_fps_time >= 5.0:
-            fps = self.fps_counter / 5.0
-            logger.info(f"📊 Live Feed FPS: {fps:.2f}")
-            self.fps_counter = 0
-            self.last_fps_time = time.time()
+        now_ns = time.monotonic_ns()
+        fps_x100 = self.fps_counter * 100_000_000_000 // max(now_ns - self.last_fps_ns, 1)
+        logger.info(f"📊 Live Feed FPS: {fps_x100 // 100}.{fps_x100 % 100:02d}")
+        self.fps_counter = 0
+        self.last_fps_ns = now_ns
+    
+    def _log_stats(self):
+        """Log upload queue depth, dropped/repeat frames and per-station inference p50/p95"""
+        timings = ", ".join(
+            f"{station} p50 {p50:.1f} ms / p95 {p95:.1f} ms"
+            for station, samples in self._inference_ns.items()
+            for p50, p95 in [np.percentile(samples, (50, 95)) / 1e6]
+        )
+        logger.info(f"📈 Upload queue {self._upload_q.qsize()}/{self._upload_q.maxsize}, "
+                    f"dropped {self._dropped}, repeats skipped {self._repeats}; "
+                    f"inference: {timings or 'none'}")
+        
+        self._inference_ns.clear()
+        self._dropped = 0
+        self._repeats = 0
+        self._next_stats_ns = time.monotonic_ns() + Config.STATS_INTERVAL * 1_000_000_000
     
     def stop(self):
         """Stop streaming"""
@@ -526,6 +962,25 @@ class AutoCaptureManager(threading.Thread):
         self.camera_manager = camera_manager
         self.backend_client = backend_client
         self.running = False
+        
+        # Captures are encoded + uploaded by workers so the next station's
+        # capture isn't held up by /api/analyze-image; libjpeg-turbo and the
+        # socket I/O release the GIL, so two run truly in parallel
+        self._pool = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="capture",
+            initializer=pin_current_thread,
+            initargs=(Config.UPLOAD_CORES,)
+        )
+    
+    def _send_one(self, camera_id: int, frame: np.ndarray):
+        """Send one capture to the backend (should_upload=True)"""
+        self.backend_client.send_capture(
+            frame=frame,
+            camera_id=camera_id,
+            is_manual=False,
+            should_upload=True
+        )
     
     def run(self):
         """Main auto-capture loop"""
@@ -546,21 +1001,12 @@ class AutoCaptureManager(threading.Thread):
                     station = CAMERA_STATION_MAP.get(camera_id)
                     logger.info(f"📸 Auto-capturing {station} station (camera {camera_id})")
                     
-                    # Switch to camera (if not already active)
-                    if self.camera_manager.get_active_id() != camera_id:
-                        self.camera_manager.open_camera(camera_id)
-                        time.sleep(0.5)  # Allow camera to stabilize
-                    
-                    # Capture frame
-                    frame = self.camera_manager.read_frame()
+                    # Capture frame straight from that camera's slot - every
+                    # camera stays open, so the live feed's camera is untouched
+                    frame = self.camera_manager.read_frame(camera_id)
                     if frame is not None:
-                        # Send to backend with should_upload=True
-                        self.backend_client.send_capture(
-                            frame=frame,
-                            camera_id=camera_id,
-                            is_manual=False,
-                            should_upload=True
-                        )
+                        # Hand off to the pool; captures are never dropped
+                        self._pool.submit(self._send_one, camera_id, frame)
                     else:
                         logger.warning(f"⚠️ Failed to capture from camera {camera_id}")
                     
@@ -574,6 +1020,7 @@ class AutoCaptureManager(threading.Thread):
     def stop(self):
         """Stop auto-capture"""
         self.running = False
+        self._pool.shutdown(wait=False)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -581,7 +1028,7 @@ class AutoCaptureManager(threading.Thread):
 # ═══════════════════════════════════════════════════════════════════════════
 
 class ActiveCameraPoller(threading.Thread):
-    """Background thread to poll backend for active camera changes"""
+    """Background thread following the backend's active camera (SSE push, polling fallback)"""
     
     def __init__(self, camera_manager: CameraManager, backend_client: BackendClient):
         super().__init__(daemon=True)
@@ -589,33 +1036,79 @@ class ActiveCameraPoller(threading.Thread):
         self.backend_client = backend_client
         self.running = False
         self.last_camera_id = None
+        self._wanted_camera_id: Optional[int] = None
+        self._switch_lock = threading.Lock()
+        self._retry_timer: Optional[threading.Timer] = None
+    
+    def _apply(self, camera_id: Optional[int]):
+        """Switch camera if the backend's choice changed"""
+        if camera_id is None:
+            return
+        with self._switch_lock:
+            self._wanted_camera_id = camera_id
+            if camera_id != self.last_camera_id:
+                logger.info(f"🔀 Active camera changed: {self.last_camera_id} → {camera_id}")
+                self._switch()
+    
+    def _switch(self):
+        """Internal: Switch to the wanted camera, retrying shortly if it isn't open yet (call with _switch_lock held)"""
+        camera_id = self._wanted_camera_id
+        if self.camera_manager.open_camera(camera_id):
+            self.last_camera_id = camera_id
+        elif self.running and (self._retry_timer is None or not self._retry_timer.is_alive()):
+            # Its grabber may still be opening it - don't wait for the next event
+            self._retry_timer = threading.Timer(Config.CAMERA_SWITCH_RETRY, self._retry_switch)
+            self._retry_timer.daemon = True
+            self._retry_timer.start()
+    
+    def _retry_switch(self):
+        """Internal: Timer callback for a switch that failed"""
+        with self._switch_lock:
+            self._retry_timer = None
+            if self._wanted_camera_id != self.last_camera_id:
+                self._switch()
     
     def run(self):
-        """Main polling loop"""
-        logger.info(f"🔄 Active camera poller started (interval: {Config.CAMERA_POLL_INTERVAL}s)")
+        """Main loop: follow the SSE stream, or poll if the backend lacks it"""
+        logger.info("🔄 Active camera follower started (SSE)")
         self.running = True
+        use_stream = True
+        delay = Config.CAMERA_RECONNECT_DELAY
         
         while self.running:
             try:
-                # Poll backend
-                camera_id = self.backend_client.get_active_camera()
-                
-                if camera_id is not None and camera_id != self.last_camera_id:
-                    logger.info(f"🔀 Active camera changed: {self.last_camera_id} → {camera_id}")
-                    
-                    # Switch camera
-                    if self.camera_manager.open_camera(camera_id):
-                        self.last_camera_id = camera_id
+                if use_stream:
+                    connected_at = time.monotonic()
+                    for camera_id in self.backend_client.stream_active_camera():
+                        if not self.running:
+                            break
+                        self._apply(camera_id)
+                    # A stream that stayed up a while was healthy; one that keeps
+                    # ending right away gets the same backoff as a failing camera
+                    if time.monotonic() - connected_at > Config.CAMERA_RECONNECT_DELAY_MAX:
+                        delay = Config.CAMERA_RECONNECT_DELAY
+                    time.sleep(delay)
+                    delay = min(delay * 2, Config.CAMERA_RECONNECT_DELAY_MAX)
+                    continue
                 
+                # Poll backend
+                self._apply(self.backend_client.get_active_camera())
                 time.sleep(Config.CAMERA_POLL_INTERVAL)
                 
+            except requests.exceptions.HTTPError as e:
+                logger.warning(f"⚠️ No active camera stream ({e}), polling every {Config.CAMERA_POLL_INTERVAL}s")
+                use_stream = False
             except Exception as e:
                 logger.error(f"❌ Camera poller error: {e}")
-                time.sleep(1.0)
+                time.sleep(delay)
+                delay = min(delay * 2, Config.CAMERA_RECONNECT_DELAY_MAX)
     
     def stop(self):
         """Stop polling"""
         self.running = False
+        with self._switch_lock:
+            if self._retry_timer is not None:
+                self._retry_timer.cancel()
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -32,7 +32,7 @@ export async function analyzeImageFile(file: File): Promise<AnalysisResponse> {
   return {
     success: data.success,
     detections: data.detections,
-    annotatedImage: data.annotatedImage,
+    annotatedImage: `${API_BASE}${data.annotatedImagePath}`,
     scratchCount: data.scratchCount || 0,
     dentCount: data.dentCount || 0,
     crackCount: data.crackCount || 0
@@ -24,6 +24,14 @@ const analyzeImageFile = async (file: File, cameraId: number, serviceRecordId?:
   return response.json();
 };
 
+// Analysis images are served as raw JPEG from a bounded server cache -
+// pull them into a local object URL so they outlive cache eviction
+const fetchImageObjectUrl = async (path: string) => {
+  const response = await fetch(`${API_URL}${path}`);
+  if (!response.ok) throw new Error("Failed to fetch analysis image");
+  return URL.createObjectURL(await response.blob());
+};
+
 // --- 2. TYPES ---
 interface AnalysisResult {
   scratches?: number;
@@ -389,8 +397,8 @@ export function LiveFeed({ showUpload = true, serviceRecordId, onAnalysisComplet
           try {
             const response = await fetch(`${API_URL}/api/station-feed/${station}`);
             const data = await response.json();
-            if (data.annotatedImage) {
-              return { station, image: `data:image/jpeg;base64,${data.annotatedImage}`, timestamp: data.timestamp };
+            if (data.imagePath) {
+              return { station, image: `${API_URL}${data.imagePath}`, timestamp: data.timestamp };
             }
             return { station, image: null, timestamp: null };
           } catch (err) {
@@ -442,10 +450,10 @@ export function LiveFeed({ showUpload = true, serviceRecordId, onAnalysisComplet
         // Also update legacy single feed for backward compatibility with main display
         const response = await fetch(`${API_URL}/api/latest-detection`);
         const data = await response.json();
-        if (data.annotatedImage) {
-          setPiImage(`data:image/jpeg;base64,${data.annotatedImage}`);
-          if (data.cleanImage) {
-            setPiRawImage(`data:image/jpeg;base64,${data.cleanImage}`);
+        if (data.annotatedImagePath) {
+          setPiImage(`${API_URL}${data.annotatedImagePath}`);
+          if (data.cleanImagePath) {
+            setPiRawImage(`${API_URL}${data.cleanImagePath}`);
           }
           setPiStats({ dents: data.dentCount, scratches: data.scratchCount, cracks: data.crackCount });
         }
@@ -481,7 +489,13 @@ export function LiveFeed({ showUpload = true, serviceRecordId, onAnalysisComplet
       const res = await fetch(sourceImage);
       const blob = await res.blob();
       file = new File([blob], "capture.jpg", { type: "image/jpeg" });
-      sourceImageUrl = sourceImage;
+
+      // Feed URLs always serve the newest frame - snapshot this one as a data URL
+      const reader = new FileReader();
+      sourceImageUrl = await new Promise<string>((resolve) => {
+        reader.onload = (e) => resolve(e.target?.result as string);
+        reader.readAsDataURL(blob);
+      });
     } else if (videoSource === 'rpi') {
       // Fetch frame from RPI camera via backend endpoint
       const selectedCameraId = selectedRpiCameras[block];
@@ -548,7 +562,7 @@ export function LiveFeed({ showUpload = true, serviceRecordId, onAnalysisComplet
       // Always save to database (works from any device/URL)
       const resData = await analyzeImageFile(file, targetId, serviceRecordId, true);
 
-      const annotatedUrl = `data:image/jpeg;base64,${resData.annotatedImage}`;
+      const annotatedUrl = await fetchImageObjectUrl(resData.annotatedImagePath);
       const hasDefects = (resData.scratchCount + resData.dentCount + resData.crackCount) > 0;
       const brakeStatus = hasDefects ? "Bad" : "Good";
 
@@ -1094,12 +1108,12 @@ export function LiveFeed({ showUpload = true, serviceRecordId, onAnalysisComplet
                                 // Always save to database (works from any device/URL)
                                 const res = await analyzeImageFile(file, targetId, serviceRecordId, true);
 
-                                if (!res.annotatedImage) {
+                                if (!res.annotatedImagePath) {
                                   console.error("Analysis failed:", res);
                                   throw new Error("No annotated image returned");
                                 }
 
-                                const annotatedUrl = `data:image/jpeg;base64,${res.annotatedImage}`;
+                                const annotatedUrl = await fetchImageObjectUrl(res.annotatedImagePath);
                                 const hasDefects = (res.scratchCount + res.dentCount + res.crackCount) > 0;
                                 const brakeStatus = hasDefects ? "Bad" : "Good";
 
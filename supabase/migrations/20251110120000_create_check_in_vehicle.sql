@@ -0,0 +1,39 @@
+/*
+  # Vehicle Check-In RPC
+
+  ## Overview
+  Fuses the check-in sequence (find or create the vehicle, then open a service record)
+  into one function, so the backend checks a car in with a single round trip and both
+  writes commit or roll back together.
+
+  ## New Functions
+
+  ### `check_in_vehicle(p_plate, p_owner, p_car_id)`
+  - Creates the vehicle if `p_plate` is new; an existing vehicle is left unchanged
+  - Inserts an 'In Progress' / 'Pending' service record for it
+  - Returns one row: `vehicle_id` (uuid), `service_record_id` (uuid)
+
+  ## Notes
+  - SECURITY INVOKER: the caller's RLS policies on vehicles/service_records still apply
+*/
+
+CREATE OR REPLACE FUNCTION check_in_vehicle(p_plate text, p_owner text, p_car_id text)
+RETURNS TABLE (vehicle_id uuid, service_record_id uuid)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  -- No-op update on conflict so RETURNING yields the existing row's id too
+  INSERT INTO vehicles (car_number_plate, car_owner_name, car_id)
+  VALUES (p_plate, p_owner, p_car_id)
+  ON CONFLICT (car_number_plate) DO UPDATE SET car_number_plate = EXCLUDED.car_number_plate
+  RETURNING vehicles.id INTO vehicle_id;
+
+  INSERT INTO service_records (vehicle_id, service_date, service_status, payment_status)
+  VALUES (check_in_vehicle.vehicle_id, now(), 'In Progress', 'Pending')
+  RETURNING service_records.id INTO service_record_id;
+
+  RETURN NEXT;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION check_in_vehicle(text, text, text) TO anon, authenticated;
@@ -0,0 +1,32 @@
+/*
+  # Batch Service Completion RPC
+
+  ## Overview
+  Closes several service tickets with one round trip instead of one UPDATE each.
+
+  ## New Functions
+
+  ### `complete_services(p_rows)`
+  - `p_rows` (jsonb) - Array of `{"id": <service record uuid>, "total_cost": <numeric>}`
+  - Sets each record to 'Completed' with its total cost and payment 'Pending'
+  - Returns the ids of the records that were updated
+
+  ## Notes
+  - A single UPDATE statement, so the whole batch applies atomically
+  - SECURITY INVOKER: the caller's RLS policies on service_records still apply
+*/
+
+CREATE OR REPLACE FUNCTION complete_services(p_rows jsonb)
+RETURNS SETOF uuid
+LANGUAGE sql
+AS $$
+  UPDATE service_records AS sr
+  SET service_status = 'Completed',
+      total_cost = r.total_cost,
+      payment_status = 'Pending'
+  FROM jsonb_to_recordset(p_rows) AS r(id uuid, total_cost numeric)
+  WHERE sr.id = r.id
+  RETURNING sr.id;
+$$;
+
+GRANT EXECUTE ON FUNCTION complete_services(jsonb) TO anon, authenticated;